@@ -1,201 +1,58 @@
-'''
-
-import pandas as pd
-from docx import Document
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_TABLE_ALIGNMENT
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-
-
-def set_table_borders(table):
-    tbl = table._tbl
-    tblPr = tbl.tblPr
-    borders = OxmlElement('w:tblBorders')
-    for border_name in ['top', 'left', 'bottom', 'right', 'insideH', 'insideV']:
-        border = OxmlElement(f'w:{border_name}')
-        border.set(qn('w:val'), 'single')
-        border.set(qn('w:sz'), '4')
-        border.set(qn('w:space'), '0')
-        border.set(qn('w:color'), '000000')
-        borders.append(border)
-    tblPr.append(borders)
-
-
-# Load Excel file
-file_path = "results.xlsx"  # Replace with actual path
-df = pd.read_excel(file_path, sheet_name='Sheet1')
-
-# Clean data
-df_clean = df.dropna(how='all')
-
-# Identify relevant columns
-subject_name_columns = [col for col in df_clean.columns if col.endswith('_SubjectName')]
-result_columns = [col for col in df_clean.columns if col.endswith('_Result')]
-total_columns = [col for col in df_clean.columns if col.endswith('_Total')]
-
-# Prepare Subject Code-Name-Appearance Table
-subject_table_data = []
-serial_no = 1
-for sub_col in subject_name_columns:
-    subject_code = sub_col.replace('_SubjectName', '')
-    subject_name_series = df_clean[sub_col].dropna().astype(str).str.strip()
-    subject_name = subject_name_series[subject_name_series != ''].unique()
-    if len(subject_name) == 0:
-        continue  # skip if blank or NA
-    subject_name = subject_name[0]
-
-    # Try to find corresponding _Result column for appearance count
-    result_col = f"{subject_code}_Result"
-    appeared = df_clean[result_col].notna().sum() if result_col in df_clean.columns else 0
-
-    subject_table_data.append([serial_no, subject_name, subject_code, appeared])
-    serial_no += 1
-
-# Calculate Total Full Marks
-df_clean['Total_Full_Marks'] = df_clean[total_columns].apply(
-    pd.to_numeric, errors='coerce').sum(axis=1)
-
-# Prepare summary results
-summary_results = {}
-for col in result_columns:
-    counts = df_clean[col].value_counts(dropna=True)
-    appeared_count = df_clean[col].notna().sum()
-    summary_results[col] = {'counts': counts, 'appeared': appeared_count}
-
-# Top 10 students
-df_top = df_clean.dropna(subset=['Total_Full_Marks'])
-top_10 = df_top.nlargest(10, 'Total_Full_Marks')[[
-    'University Seat Number', 'Student Name', 'Total_Full_Marks'
-]]
-
-# Create Word document
-doc = Document()
-doc.add_heading("Student Results Summary Report", 0).alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-# Section 0: Subject Code and Name Summary
-doc.add_heading("Subject Code and Name Summary", level=1).alignment = WD_ALIGN_PARAGRAPH.CENTER
-table = doc.add_table(rows=1, cols=4)
-set_table_borders(table)
-table.alignment = WD_TABLE_ALIGNMENT.CENTER
-hdr_cells = table.rows[0].cells
-hdr_cells[0].text = "S.No"
-hdr_cells[1].text = "Subject Name"
-hdr_cells[2].text = "Subject Code"
-hdr_cells[3].text = "Total Appeared"
-
-for row in subject_table_data:
-    row_cells = table.add_row().cells
-    for i, val in enumerate(row):
-        row_cells[i].text = str(val)
-
-# Section 1: Summary of Results by Subject
-doc.add_heading("Summary of Results by Subject", level=1).alignment = WD_ALIGN_PARAGRAPH.CENTER
-for subject, data in summary_results.items():
-    doc.add_heading(subject, level=2).alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-    table = doc.add_table(rows=1, cols=3)
-    set_table_borders(table)
-    table.alignment = WD_TABLE_ALIGNMENT.CENTER
-
-    hdr_cells = table.rows[0].cells
-    hdr_cells[0].text = 'Result'
-    hdr_cells[1].text = 'Count'
-    hdr_cells[2].text = 'Percentage'
-
-    total_appeared = data['appeared']
-    for result, count in data['counts'].items():
-        percentage = (count / total_appeared) * 100 if total_appeared > 0 else 0
-        row_cells = table.add_row().cells
-        row_cells[0].text = str(result)
-        row_cells[1].text = str(count)
-        row_cells[2].text = f"{percentage:.2f}%"
-
-    # Total Appeared
-    row_cells = table.add_row().cells
-    row_cells[0].text = 'Total Appeared'
-    row_cells[1].text = str(total_appeared)
-    row_cells[2].text = '—'
-
-# Section 2: Top 10 Students
-doc.add_heading("Top 10 Students by Total Full Marks", level=1).alignment = WD_ALIGN_PARAGRAPH.CENTER
-table = doc.add_table(rows=1, cols=3)
-set_table_borders(table)
-table.alignment = WD_TABLE_ALIGNMENT.CENTER
-
-hdr_cells = table.rows[0].cells
-hdr_cells[0].text = 'University Seat Number'
-hdr_cells[1].text = 'Student Name'
-hdr_cells[2].text = 'Total Full Marks'
-
-for _, row in top_10.iterrows():
-    row_cells = table.add_row().cells
-    row_cells[0].text = str(row['University Seat Number'])
-    row_cells[1].text = str(row['Student Name'])
-    row_cells[2].text = str(int(row['Total_Full_Marks']))
-
-# Section 3: Top Performer in Each Subject
-doc.add_heading("Top Performer in Each Subject", level=1).alignment = WD_ALIGN_PARAGRAPH.CENTER
-table = doc.add_table(rows=1, cols=5)
-set_table_borders(table)
-table.alignment = WD_TABLE_ALIGNMENT.CENTER
-
-hdr_cells = table.rows[0].cells
-hdr_cells[0].text = "Student Name"
-hdr_cells[1].text = "University Seat Number"
-hdr_cells[2].text = "Subject Code"
-hdr_cells[3].text = "Subject Marks"
-hdr_cells[4].text = "Total Full Marks"
-
-for col in total_columns:
-    subject_scores = pd.to_numeric(df_clean[col], errors='coerce')
-    max_score = subject_scores.max()
-    top_rows = df_clean[subject_scores == max_score]
-
-    for _, row in top_rows.iterrows():
-        row_cells = table.add_row().cells
-        row_cells[0].text = str(row['Student Name'])
-        row_cells[1].text = str(row['University Seat Number'])
-        row_cells[2].text = col.replace('_Total', '')  # Remove _Total from subject name
-        row_cells[3].text = str(int(max_score)) if pd.notna(max_score) else ""
-        row_cells[4].text = str(int(row['Total_Full_Marks'])) if pd.notna(row['Total_Full_Marks']) else ""
-
-# Save Word file
-output_file = "Student_Results_Summary.docx"
-doc.save(output_file)
-print(f"Report saved as {output_file}")
-'''
-
-'''
-import pandas as pd
-from docx import Document
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_TABLE_ALIGNMENT
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
 import os
+from xml.sax.saxutils import escape
+
+# pandas, python-docx and the Parquet loader are slow to import and only needed
+# once a report is generated, so _load_dependencies() imports them on first use
+pd = None
+Document = WD_ALIGN_PARAGRAPH = WD_TABLE_ALIGNMENT = None
+OxmlElement = parse_xml = nsdecls = qn = None
+load_columnar = None
+
+
+def _load_dependencies():
+    """Import the report dependencies into this module (once)"""
+    global pd, Document, WD_ALIGN_PARAGRAPH, WD_TABLE_ALIGNMENT, OxmlElement, parse_xml, nsdecls, qn
+    global load_columnar
+    if pd is not None:
+        return
+    import pandas
+    from docx import Document
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.enum.table import WD_TABLE_ALIGNMENT
+    from docx.oxml import OxmlElement, parse_xml
+    from docx.oxml.ns import nsdecls, qn
+    from columnar_store import load_columnar
+    pd = pandas
+
+FAIL_RESULTS = ['f', 'fail', 'failed', 'ab', 'absent']
 
 
 class ResultAnalyzer:
     def __init__(self, excel_file_path):
+        _load_dependencies()
         self.excel_file = excel_file_path
         self.df = None
         self.df_clean = None
         self.subject_name_columns = []
         self.result_columns = []
         self.total_columns = []
+        self.subject_stats = None
+        self._fails = None
 
     def load_and_prepare_data(self):
         """Load and clean data with comprehensive validation"""
         try:
-            self.df = pd.read_excel(
-                self.excel_file,
-                sheet_name='Sheet1',
-                dtype={
-                    'University Seat Number': str,
-                    'Student Name': str
-                }
-            )
+            # The scraper's Parquet copy loads far faster than the workbook
+            self.df = load_columnar(self.excel_file)
+            if self.df is None:
+                self.df = pd.read_excel(
+                    self.excel_file,
+                    sheet_name='Sheet1',
+                    dtype={
+                        'University Seat Number': str,
+                        'Student Name': str
+                    }
+                )
 
             if not isinstance(self.df, pd.DataFrame):
                 raise ValueError("Input is not a valid DataFrame")
@@ -252,333 +109,120 @@ class ResultAnalyzer:
             borders.append(border)
         tblPr.append(borders)
 
-    def generate_report(self, output_file=None):
-        """Generate report with full error handling"""
-        if not hasattr(self, 'df_clean') or self.df_clean is None:
-            raise ValueError("Data not loaded. Call load_and_prepare_data() first")
-
-        if self.df_clean.empty:
-            raise ValueError("No data available to generate report")
-
-        if not output_file:
-            base_name = os.path.splitext(os.path.basename(self.excel_file))[0]
-            output_file = f"{base_name}_Analysis_Report.docx"
-
-        try:
-            # Calculate Total Full Marks safely
-            self.df_clean['Total_Full_Marks'] = self.df_clean[self.total_columns] \
-                .apply(pd.to_numeric, errors='coerce') \
-                .sum(axis=1, min_count=1)  # min_count requires at least 1 valid value
-
-            doc = Document()
-            self._add_title_section(doc)
-            self._add_subject_summary(doc)
-            self._add_results_by_subject(doc)
-            self._add_top_students(doc)
-            self._add_top_performers_by_subject(doc)
-
-            doc.save(output_file)
-            return output_file
-
-        except Exception as e:
-            raise ValueError(f"Report generation failed: {str(e)}")
-
-    def _add_title_section(self, doc):
-        """Add title section"""
-        doc.add_heading("Student Results Summary Report", 0) \
-            .alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-    def _add_subject_summary(self, doc):
-        """Add subject summary with validation"""
-        doc.add_heading("Subject Code and Name Summary", level=1) \
-            .alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        table = doc.add_table(rows=1, cols=4)
-        self.set_table_borders(table)
-        table.alignment = WD_TABLE_ALIGNMENT.CENTER
-
-        hdr_cells = table.rows[0].cells
-        hdr_cells[0].text = "S.No"
-        hdr_cells[1].text = "Subject Name"
-        hdr_cells[2].text = "Subject Code"
-        hdr_cells[3].text = "Total Appeared"
-
-        serial_no = 1
-        for sub_col in self.subject_name_columns:
-            try:
-                subject_code = sub_col.replace('_SubjectName', '')
-                subject_name = self.df_clean[sub_col].dropna().astype(str).str.strip()
-                subject_name = subject_name[subject_name != ''].unique()
-
-                if len(subject_name) == 0:
-                    continue
-
-                subject_name = subject_name[0]
-                result_col = f"{subject_code}_Result"
-
-                appeared = 0
-                if result_col in self.df_clean.columns:
-                    appeared = self.df_clean[result_col].notna().sum()
-
-                row_cells = table.add_row().cells
-                row_cells[0].text = str(serial_no)
-                row_cells[1].text = subject_name
-                row_cells[2].text = subject_code
-                row_cells[3].text = str(appeared)
-                serial_no += 1
-
-            except Exception:
-                continue
-
-    def _add_results_by_subject(self, doc):
-        """Add results by subject with safe DataFrame handling"""
-        doc.add_heading("Summary of Results by Subject", level=1) \
-            .alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        for col in self.result_columns:
-            try:
-                results = self.df_clean[col].dropna()
-                if results.empty:
-                    continue
-
-                counts = results.value_counts()
-                appeared_count = len(results)
-
-                doc.add_heading(col, level=2).alignment = WD_ALIGN_PARAGRAPH.CENTER
-                table = doc.add_table(rows=1, cols=3)
-                self.set_table_borders(table)
-                table.alignment = WD_TABLE_ALIGNMENT.CENTER
-
-                hdr_cells = table.rows[0].cells
-                hdr_cells[0].text = 'Result'
-                hdr_cells[1].text = 'Count'
-                hdr_cells[2].text = 'Percentage'
-
-                for result, count in counts.items():
-                    percentage = (count / appeared_count) * 100
-                    row_cells = table.add_row().cells
-                    row_cells[0].text = str(result)
-                    row_cells[1].text = str(count)
-                    row_cells[2].text = f"{percentage:.2f}%"
-
-                row_cells = table.add_row().cells
-                row_cells[0].text = 'Total Appeared'
-                row_cells[1].text = str(appeared_count)
-                row_cells[2].text = '—'
-
-            except Exception:
-                continue
-
-    def _add_top_students(self, doc):
-        """Add top students section with validation"""
-        doc.add_heading("Top 10 Students by Total Full Marks", level=1) \
-            .alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        try:
-            df_top = self.df_clean.dropna(subset=['Total_Full_Marks'])
-            if df_top.empty:
-                return
-
-            top_10 = df_top.nlargest(10, 'Total_Full_Marks')[[
-                'University Seat Number', 'Student Name', 'Total_Full_Marks'
-            ]]
-
-            if top_10.empty:
-                return
-
-            table = doc.add_table(rows=1, cols=3)
-            self.set_table_borders(table)
-            table.alignment = WD_TABLE_ALIGNMENT.CENTER
-
-            hdr_cells = table.rows[0].cells
-            hdr_cells[0].text = 'University Seat Number'
-            hdr_cells[1].text = 'Student Name'
-            hdr_cells[2].text = 'Total Full Marks'
-
-            for _, row in top_10.iterrows():
-                row_cells = table.add_row().cells
-                row_cells[0].text = str(row['University Seat Number'])
-                row_cells[1].text = str(row['Student Name'])
-                row_cells[2].text = str(int(row['Total_Full_Marks']))
+    @staticmethod
+    def add_table_rows(table, rows):
+        """Append rows of cell values to a table in one go.
 
-        except Exception:
+        All row XML is generated as one string and parsed once, instead of
+        table.add_row().cells per row, which re-walks the table every time.
+        """
+        if not rows:
             return
-
-    def _add_top_performers_by_subject(self, doc):
-        """Completely fixed top performers section"""
-        doc.add_heading("Top Performer in Each Subject", level=1) \
-            .alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        table = doc.add_table(rows=1, cols=5)
-        self.set_table_borders(table)
-        table.alignment = WD_TABLE_ALIGNMENT.CENTER
-
-        hdr_cells = table.rows[0].cells
-        hdr_cells[0].text = "Student Name"
-        hdr_cells[1].text = "University Seat Number"
-        hdr_cells[2].text = "Subject Code"
-        hdr_cells[3].text = "Subject Marks"
-        hdr_cells[4].text = "Total Full Marks"
-
-        for col in self.total_columns:
-            try:
-                subject_scores = pd.to_numeric(self.df_clean[col], errors='coerce')
-
-                if not subject_scores.notna().any():
-                    continue
-
-                max_score = subject_scores.max()
-                if pd.isna(max_score):
-                    continue
-
-                mask = subject_scores.notna() & (subject_scores == max_score)
-                if not mask.any():
-                    continue
-
-                top_rows = self.df_clean.loc[mask]
-                if top_rows.empty:
-                    continue
-
-                for _, row in top_rows.iterrows():
-                    row_cells = table.add_row().cells
-                    row_cells[0].text = str(row.get('Student Name', ''))
-                    row_cells[1].text = str(row.get('University Seat Number', ''))
-                    row_cells[2].text = col.replace('_Total', '')
-                    row_cells[3].text = str(int(max_score)) if pd.notna(max_score) else ""
-                    row_cells[4].text = str(int(row.get('Total_Full_Marks', 0))) \
-                        if pd.notna(row.get('Total_Full_Marks')) else ""
-
-            except Exception:
-                continue
-
-
-def analyze_results(excel_file_path, output_file=None):
-    """Public interface with error handling"""
-    try:
-        analyzer = ResultAnalyzer(excel_file_path)
-        analyzer.load_and_prepare_data()
-        return analyzer.generate_report(output_file)
-    except Exception as e:
-        raise ValueError(f"Analysis failed: {str(e)}")
-'''
-
-import pandas as pd
-from docx import Document
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_TABLE_ALIGNMENT
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-import os
-
-
-class ResultAnalyzer:
-    def __init__(self, excel_file_path):
-        self.excel_file = excel_file_path
-        self.df = None
-        self.df_clean = None
-        self.subject_name_columns = []
-        self.result_columns = []
-        self.total_columns = []
-
-    def load_and_prepare_data(self):
-        """Load and clean data with comprehensive validation"""
-        try:
-            self.df = pd.read_excel(
-                self.excel_file,
-                sheet_name='Sheet1',
-                dtype={
-                    'University Seat Number': str,
-                    'Student Name': str
-                }
-            )
-
-            if not isinstance(self.df, pd.DataFrame):
-                raise ValueError("Input is not a valid DataFrame")
-
-            if self.df.empty:
-                raise ValueError("Input Excel file is empty")
-
-            self.df_clean = self.df.dropna(how='all')
-
-            if self.df_clean.empty:
-                raise ValueError("No valid data after cleaning")
-
-            self._identify_columns()
-
-            # Validate required columns exist
-            required = ['Student Name', 'University Seat Number']
-            missing = [col for col in required if col not in self.df_clean.columns]
-            if missing:
-                raise ValueError(f"Missing required columns: {', '.join(missing)}")
-
-        except Exception as e:
-            raise ValueError(f"Data loading failed: {str(e)}")
-
-    def _identify_columns(self):
-        """Identify columns with validation"""
-        self.subject_name_columns = [
-            col for col in self.df_clean.columns
-            if isinstance(col, str) and col.endswith('_SubjectName')
-        ]
-        self.result_columns = [
-            col for col in self.df_clean.columns
-            if isinstance(col, str) and col.endswith('_Result')
-        ]
-        self.total_columns = [
-            col for col in self.df_clean.columns
-            if isinstance(col, str) and col.endswith('_Total')
-        ]
-
-        if not self.subject_name_columns:
-            raise ValueError("No subject name columns found")
+        cells = []
+        for grid_col in table._tbl.tblGrid.gridCol_lst:
+            width = f'<w:tcPr><w:tcW w:w="{grid_col.w.twips}" w:type="dxa"/></w:tcPr>' if grid_col.w is not None else ''
+            cells.append(f'<w:tc>{width}<w:p><w:r><w:t xml:space="preserve">{{}}</w:t></w:r></w:p></w:tc>')
+        rows_xml = ''.join(
+            '<w:tr>' + ''.join(cell.format(escape(str(value))) for cell, value in zip(cells, row)) + '</w:tr>'
+            for row in rows)
+        parsed = parse_xml(f'<w:tbl {nsdecls("w")}>{rows_xml}</w:tbl>')
+        table._tbl.extend(list(parsed.tr_lst))
 
     @staticmethod
-    def set_table_borders(table):
-        """Set table borders in Word doc"""
-        tbl = table._tbl
-        tblPr = tbl.tblPr
-        borders = OxmlElement('w:tblBorders')
-        for border_name in ['top', 'left', 'bottom', 'right', 'insideH', 'insideV']:
-            border = OxmlElement(f'w:{border_name}')
-            border.set(qn('w:val'), 'single')
-            border.set(qn('w:sz'), '4')
-            border.set(qn('w:space'), '0')
-            border.set(qn('w:color'), '000000')
-            borders.append(border)
-        tblPr.append(borders)
+    def _fail_mask(results):
+        """Boolean Series: which cells of one _Result column indicate a failure"""
+        if pd.api.types.is_numeric_dtype(results):
+            # Numeric results fail below 35 (assumed passing marks)
+            return (results < 35).fillna(False).astype(bool)
+        # Text results fail on these codes (adjust to your grading system)
+        try:
+            text = results.str
+        except AttributeError:  # object column without any strings
+            return (pd.to_numeric(results, errors='coerce') < 35).fillna(False).astype(bool)
+        is_text = text.len().notna()
+        failed = text.strip().str.lower().isin(FAIL_RESULTS) & is_text
+        numbers = pd.to_numeric(results.where(~is_text), errors='coerce')
+        return (failed | (numbers < 35)).fillna(False).astype(bool)
+
+    def _failures(self):
+        """Fail mask for every _Result column (one boolean column each), computed once"""
+        if self._fails is None:
+            self._fails = pd.DataFrame({col: self._fail_mask(self.df_clean[col]) for col in self.result_columns},
+                                       index=self.df_clean.index)
+        return self._fails
+
+    def compute_subject_stats(self):
+        """Compute every per-subject statistic the report uses in one pass and cache it.
+
+        ``self.subject_stats`` has one row per subject code with SubjectName,
+        Appeared, ResultCounts (a value_counts Series), PassRate, MaxMarks,
+        MeanMarks and TopScorers (row positions of everyone on MaxMarks).
+        PassRate and MeanMarks are cached for callers; the report does not
+        render them.
+        """
+        df = self.df_clean
+        name_codes = [col.replace('_SubjectName', '') for col in self.subject_name_columns]
+        result_codes = [col.replace('_Result', '') for col in self.result_columns]
+        total_codes = [col.replace('_Total', '') for col in self.total_columns]
+        stats = pd.DataFrame(index=pd.Index(list(dict.fromkeys(name_codes + result_codes + total_codes))))
+
+        # First non-blank subject name in each column
+        names = df[self.subject_name_columns].astype('string') \
+            .apply(lambda col: col.str.strip()).replace('', pd.NA)
+        stats['SubjectName'] = pd.Series(names.bfill().iloc[0].to_numpy() if len(names) else pd.NA,
+                                         index=name_codes, dtype=object)
+
+        # Result counts, appearances and pass rate from the result columns
+        results = df[self.result_columns]
+        appeared = pd.Series(results.notna().sum().to_numpy(), index=result_codes)
+        stats['Appeared'] = appeared.reindex(stats.index, fill_value=0)
+        counted = results.melt(var_name='column', value_name='result').dropna()
+        counts = counted.groupby(['column', 'result'], sort=False).size()
+        stats['ResultCounts'] = pd.Series(
+            [counts[col].sort_values(ascending=False, kind='stable') if col in counts.index.levels[0]
+             and appeared[code] else pd.Series(dtype='int64') for col, code in zip(self.result_columns, result_codes)],
+            index=result_codes, dtype=object)
+        passed = appeared - pd.Series(self._failures().sum().to_numpy(), index=result_codes)
+        stats['PassRate'] = (passed / appeared.where(appeared > 0)) * 100
+
+        # Marks: max, mean and everyone on the max
+        totals = df[self.total_columns].apply(pd.to_numeric, errors='coerce')
+        stats['MaxMarks'] = pd.Series(totals.max().to_numpy(), index=total_codes)
+        stats['MeanMarks'] = pd.Series(totals.mean().to_numpy(), index=total_codes)
+        on_max = (totals.eq(totals.max()) & totals.notna()).to_numpy()
+        stats['TopScorers'] = pd.Series([on_max[:, i].nonzero()[0] for i in range(len(total_codes))],
+                                        index=total_codes, dtype=object)
+
+        self.subject_stats = stats
+        return stats
 
     def _identify_failed_students(self):
         """Identify students who failed in any one subject"""
-        failed_students = []
         total_students = len(self.df_clean)
-
-        for _, student in self.df_clean.iterrows():
-            student_failed = False
-            failed_subjects = []
-
-            for result_col in self.result_columns:
-                result = student.get(result_col)
-                # Check if result indicates failure (you might need to adjust these conditions based on your grading system)
-                if pd.notna(result) and isinstance(result, str):
-                    result_lower = result.strip().lower()
-                    if result_lower in ['f', 'fail', 'failed', 'ab', 'absent']:
-                        student_failed = True
-                        subject_code = result_col.replace('_Result', '')
-                        failed_subjects.append(subject_code)
-                # Also check numeric failure conditions if applicable
-                elif pd.notna(result) and isinstance(result, (int, float)):
-                    if result < 35:  # Assuming 35 is passing marks
-                        student_failed = True
-                        subject_code = result_col.replace('_Result', '')
-                        failed_subjects.append(subject_code)
-
-            if student_failed:
-                failed_students.append({
-                    'Student Name': student.get('Student Name', ''),
-                    'University Seat Number': student.get('University Seat Number', ''),
-                    'Failed Subjects': ', '.join(failed_subjects),
-                    'Total Failed Subjects': len(failed_subjects)
-                })
+        if not self.result_columns:
+            return [], total_students
+
+        # One boolean column per subject, then the failed codes joined per student
+        fails = self._failures().copy()
+        fails.columns = [col.replace('_Result', '') + ', ' for col in self.result_columns]
+        failed_rows = fails.any(axis=1).to_numpy()
+        if not failed_rows.any():
+            return [], total_students
+
+        fails = fails[failed_rows]
+        subjects = fails.to_numpy(dtype=object).dot(fails.columns.to_numpy(dtype=object))
+        counts = fails.sum(axis=1).tolist()
+        names = self.df_clean['Student Name'][failed_rows].tolist() \
+            if 'Student Name' in self.df_clean.columns else [''] * len(counts)
+        usns = self.df_clean['University Seat Number'][failed_rows].tolist() \
+            if 'University Seat Number' in self.df_clean.columns else [''] * len(counts)
+
+        failed_students = [{
+            'Student Name': name,
+            'University Seat Number': usn,
+            'Failed Subjects': failed_subjects[:-2],
+            'Total Failed Subjects': count
+        } for name, usn, failed_subjects, count in zip(names, usns, subjects, counts)]
 
         return failed_students, total_students
 
@@ -599,6 +243,7 @@ class ResultAnalyzer:
             self.df_clean['Total_Full_Marks'] = self.df_clean[self.total_columns] \
                 .apply(pd.to_numeric, errors='coerce') \
                 .sum(axis=1, min_count=1)  # min_count requires at least 1 valid value
+            self.compute_subject_stats()
 
             doc = Document()
             self._add_title_section(doc)
@@ -649,11 +294,12 @@ class ResultAnalyzer:
             pass_percentage = 0
             fail_percentage = 0
 
-        data_cells = summary_table.add_row().cells
-        data_cells[0].text = str(total_students)
-        data_cells[1].text = f"{pass_count} ({pass_percentage:.2f}%)"
-        data_cells[2].text = f"{failed_count} ({fail_percentage:.2f}%)"
-        data_cells[3].text = f"{pass_percentage:.2f}%"
+        self.add_table_rows(summary_table, [[
+            total_students,
+            f"{pass_count} ({pass_percentage:.2f}%)",
+            f"{failed_count} ({fail_percentage:.2f}%)",
+            f"{pass_percentage:.2f}%",
+        ]])
 
         doc.add_paragraph()  # Add some space
 
@@ -671,12 +317,11 @@ class ResultAnalyzer:
             hdr_cells[2].text = "University Seat Number"
             hdr_cells[3].text = "Failed Subjects (Count)"
 
-            for i, student in enumerate(failed_students, 1):
-                row_cells = table.add_row().cells
-                row_cells[0].text = str(i)
-                row_cells[1].text = student['Student Name']
-                row_cells[2].text = student['University Seat Number']
-                row_cells[3].text = f"{student['Failed Subjects']} ({student['Total Failed Subjects']})"
+            self.add_table_rows(table, [
+                [i, student['Student Name'], student['University Seat Number'],
+                 f"{student['Failed Subjects']} ({student['Total Failed Subjects']})"]
+                for i, student in enumerate(failed_students, 1)
+            ])
         else:
             doc.add_paragraph("No failed students found.", style='Intense Quote')
 
@@ -697,33 +342,21 @@ class ResultAnalyzer:
         hdr_cells[2].text = "Subject Code"
         hdr_cells[3].text = "Total Appeared"
 
-        serial_no = 1
+        rows = []
         for sub_col in self.subject_name_columns:
-            try:
-                subject_code = sub_col.replace('_SubjectName', '')
-                subject_name = self.df_clean[sub_col].dropna().astype(str).str.strip()
-                subject_name = subject_name[subject_name != ''].unique()
-
-                if len(subject_name) == 0:
-                    continue
-
-                subject_name = subject_name[0]
-                result_col = f"{subject_code}_Result"
-
-                appeared = 0
-                if result_col in self.df_clean.columns:
-                    appeared = self.df_clean[result_col].notna().sum()
-
-                row_cells = table.add_row().cells
-                row_cells[0].text = str(serial_no)
-                row_cells[1].text = subject_name
-                row_cells[2].text = subject_code
-                row_cells[3].text = str(appeared)
-                serial_no += 1
-
-            except Exception:
+            subject_code = sub_col.replace('_SubjectName', '')
+            stats = self.subject_stats.loc[subject_code]
+            if pd.isna(stats['SubjectName']):
                 continue
 
+            rows.append([
+                len(rows) + 1,
+                stats['SubjectName'],
+                subject_code,
+                int(stats['Appeared']),
+            ])
+        self.add_table_rows(table, rows)
+
     def _add_results_by_subject(self, doc):
         """Add results by subject with safe DataFrame handling"""
         doc.add_heading("Summary of Results by Subject", level=1) \
@@ -731,12 +364,11 @@ class ResultAnalyzer:
 
         for col in self.result_columns:
             try:
-                results = self.df_clean[col].dropna()
-                if results.empty:
+                counts = self.subject_stats.at[col.replace('_Result', ''), 'ResultCounts']
+                if counts.empty:
                     continue
 
-                counts = results.value_counts()
-                appeared_count = len(results)
+                appeared_count = int(counts.sum())
 
                 doc.add_heading(col, level=2).alignment = WD_ALIGN_PARAGRAPH.CENTER
                 table = doc.add_table(rows=1, cols=3)
@@ -748,17 +380,10 @@ class ResultAnalyzer:
                 hdr_cells[1].text = 'Count'
                 hdr_cells[2].text = 'Percentage'
 
-                for result, count in counts.items():
-                    percentage = (count / appeared_count) * 100
-                    row_cells = table.add_row().cells
-                    row_cells[0].text = str(result)
-                    row_cells[1].text = str(count)
-                    row_cells[2].text = f"{percentage:.2f}%"
-
-                row_cells = table.add_row().cells
-                row_cells[0].text = 'Total Appeared'
-                row_cells[1].text = str(appeared_count)
-                row_cells[2].text = '—'
+                rows = [[result, count, f"{(count / appeared_count) * 100:.2f}%"]
+                        for result, count in counts.items()]
+                rows.append(['Total Appeared', appeared_count, '—'])
+                self.add_table_rows(table, rows)
 
             except Exception:
                 continue
@@ -789,11 +414,10 @@ class ResultAnalyzer:
             hdr_cells[1].text = 'Student Name'
             hdr_cells[2].text = 'Total Full Marks'
 
-            for _, row in top_10.iterrows():
-                row_cells = table.add_row().cells
-                row_cells[0].text = str(row['University Seat Number'])
-                row_cells[1].text = str(row['Student Name'])
-                row_cells[2].text = str(int(row['Total_Full_Marks']))
+            self.add_table_rows(table, [
+                [usn, name, int(total)] for usn, name, total in zip(
+                    top_10['University Seat Number'], top_10['Student Name'], top_10['Total_Full_Marks'])
+            ])
 
         except Exception:
             return
@@ -814,36 +438,33 @@ class ResultAnalyzer:
         hdr_cells[3].text = "Subject Marks"
         hdr_cells[4].text = "Total Full Marks"
 
-        for col in self.total_columns:
-            try:
-                subject_scores = pd.to_numeric(self.df_clean[col], errors='coerce')
-
-                if not subject_scores.notna().any():
-                    continue
-
-                max_score = subject_scores.max()
-                if pd.isna(max_score):
-                    continue
+        # Plain lists of the columns used, so each table row is just a few index lookups
+        def column(name, default):
+            if name in self.df_clean.columns:
+                return self.df_clean[name].tolist()
+            return [default] * len(self.df_clean)
 
-                mask = subject_scores.notna() & (subject_scores == max_score)
-                if not mask.any():
-                    continue
+        names = column('Student Name', '')
+        usns = column('University Seat Number', '')
+        totals = column('Total_Full_Marks', None)
 
-                top_rows = self.df_clean.loc[mask]
-                if top_rows.empty:
+        rows = []
+        for col in self.total_columns:
+            try:
+                subject_code = col.replace('_Total', '')
+                stats = self.subject_stats.loc[subject_code]
+                max_score = stats['MaxMarks']
+                if pd.isna(max_score) or not len(stats['TopScorers']):
                     continue
 
-                for _, row in top_rows.iterrows():
-                    row_cells = table.add_row().cells
-                    row_cells[0].text = str(row.get('Student Name', ''))
-                    row_cells[1].text = str(row.get('University Seat Number', ''))
-                    row_cells[2].text = col.replace('_Total', '')
-                    row_cells[3].text = str(int(max_score)) if pd.notna(max_score) else ""
-                    row_cells[4].text = str(int(row.get('Total_Full_Marks', 0))) \
-                        if pd.notna(row.get('Total_Full_Marks')) else ""
+                marks = int(max_score)
+                rows.extend(
+                    [names[i], usns[i], subject_code, marks, int(totals[i]) if pd.notna(totals[i]) else ""]
+                    for i in stats['TopScorers'])
 
             except Exception:
                 continue
+        self.add_table_rows(table, rows)
 
 
 def analyze_results(excel_file_path, output_file=None):
@@ -856,7 +477,6 @@ def analyze_results(excel_file_path, output_file=None):
         raise ValueError(f"Analysis failed: {str(e)}")
 
 
-
 def test_with_existing_file():
     """Test with your existing Excel file"""
     try:
@@ -873,9 +493,5 @@ def test_with_existing_file():
         print(f"✗ Error: {e}")
 
 
-# Run the test
-test_with_existing_file()
-
-
-
-
+if __name__ == "__main__":
+    test_with_existing_file()
@@ -0,0 +1,166 @@
+import argparse
+import glob
+import os
+import sys
+import threading
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+CAPTCHA_LENGTH = 6
+GLYPH_SIZE = (12, 16)  # width, height every glyph is normalised to
+MIN_GLYPH_PIXELS = 4   # spans with fewer text pixels are treated as specks
+DEFAULT_DATASET_DIR = "captcha_dataset"
+DEFAULT_MODEL_PATH = "captcha_knn.npz"
+
+
+class CaptchaDataset:
+    """Directory of verified CAPTCHAs stored as ``{answer}_{timestamp}.png``"""
+
+    def __init__(self, directory=DEFAULT_DATASET_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, image_bytes, answer):
+        """Store a CAPTCHA image the portal accepted together with its answer"""
+        with self._lock:
+            path = os.path.join(self.directory, f"{answer}_{time.time_ns()}.png")
+            with open(path, "wb") as f:
+                f.write(image_bytes)
+        return path
+
+    def samples(self):
+        """Yield (answer, image bytes) for every stored CAPTCHA"""
+        for path in sorted(glob.glob(os.path.join(self.directory, "*.png"))):
+            answer = os.path.splitext(os.path.basename(path))[0].split("_")[0]
+            with open(path, "rb") as f:
+                yield answer, f.read()
+
+
+def text_mask(image):
+    """Boolean mask of text pixels in a cleaned (text on white) CAPTCHA image"""
+    return np.asarray(image.convert("L")) < 200
+
+
+def segment_glyphs(mask, expected=CAPTCHA_LENGTH):
+    """Split a text mask into per-character bitmaps using its column projection.
+
+    Touching characters are split at the middle of the widest span and stray
+    fragments are merged across the narrowest gap until ``expected`` glyphs
+    remain. Returns an empty list if the mask cannot be split that way.
+    """
+    columns = mask.any(axis=0)
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], columns, [False])).astype(np.int8)))
+    spans = [(start, end) for start, end in zip(edges[::2], edges[1::2])
+             if mask[:, start:end].sum() >= MIN_GLYPH_PIXELS]
+
+    while 0 < len(spans) < expected:
+        i = max(range(len(spans)), key=lambda k: spans[k][1] - spans[k][0])
+        start, end = spans[i]
+        if end - start < 2:
+            break
+        middle = (start + end) // 2
+        spans[i:i + 1] = [(start, middle), (middle, end)]
+
+    while len(spans) > expected:
+        i = min(range(len(spans) - 1), key=lambda k: spans[k + 1][0] - spans[k][1])
+        spans[i:i + 2] = [(spans[i][0], spans[i + 1][1])]
+
+    if len(spans) != expected:
+        return []
+
+    glyphs = []
+    for start, end in spans:
+        glyph = mask[:, start:end]
+        rows = np.flatnonzero(glyph.any(axis=1))
+        glyphs.append(glyph[rows[0]:rows[-1] + 1])
+    return glyphs
+
+
+def glyph_features(glyphs):
+    """Resize glyph bitmaps to GLYPH_SIZE and stack them as float feature rows"""
+    features = np.empty((len(glyphs), GLYPH_SIZE[0] * GLYPH_SIZE[1]), dtype=np.float32)
+    for i, glyph in enumerate(glyphs):
+        resized = Image.fromarray(glyph.astype(np.uint8) * 255).resize(GLYPH_SIZE, Image.BILINEAR)
+        features[i] = np.asarray(resized, dtype=np.float32).ravel() / 255.0
+    return features
+
+
+class KNNCaptchaClassifier:
+    """CPU-only CAPTCHA solver: column segmentation plus k-nearest-neighbour glyph matching.
+
+    Used as a CaptchaHandler OCR backend. CAPTCHAs it cannot segment into
+    CAPTCHA_LENGTH glyphs are passed to ``fallback`` (if any).
+    """
+    name = "knn"
+
+    def __init__(self, features, labels, k=1, fallback=None):
+        self.features = np.asarray(features, dtype=np.float32)
+        self.labels = np.asarray(labels)
+        self.k = k
+        self.fallback = fallback
+        self._norms = (self.features ** 2).sum(axis=1)
+
+    @classmethod
+    def train(cls, dataset, isolate_text=None, **kwargs):
+        """Build a classifier from a CaptchaDataset; ``isolate_text`` cleans each raw image"""
+        if isolate_text is None:
+            from captcha_handler import CaptchaHandler
+            isolate_text = CaptchaHandler(ocr_backend=None).isolate_text
+
+        features, labels = [], []
+        for answer, data in dataset.samples():
+            glyphs = segment_glyphs(text_mask(isolate_text(Image.open(BytesIO(data)))), len(answer))
+            if glyphs:
+                features.append(glyph_features(glyphs))
+                labels.extend(answer)
+        if not features:
+            raise ValueError(f"No usable samples in {dataset.directory}")
+        return cls(np.vstack(features), labels, **kwargs)
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL_PATH, **kwargs):
+        with np.load(path) as model:
+            return cls(model["features"], model["labels"], **kwargs)
+
+    def save(self, path=DEFAULT_MODEL_PATH):
+        np.savez_compressed(path, features=self.features, labels=self.labels)
+
+    def predict_glyphs(self, features):
+        # Squared euclidean distance via |a|^2 - 2ab + |b|^2
+        distances = self._norms[None, :] - 2 * features @ self.features.T
+        if self.k == 1:
+            return self.labels[distances.argmin(axis=1)]
+        nearest = np.argpartition(distances, self.k - 1, axis=1)[:, :self.k]
+        predictions = []
+        for row in self.labels[nearest]:
+            values, counts = np.unique(row, return_counts=True)
+            predictions.append(values[counts.argmax()])
+        return predictions
+
+    def recognize(self, image):
+        glyphs = segment_glyphs(text_mask(image))
+        if not glyphs:
+            return self.fallback.recognize(image) if self.fallback else ""
+        return "".join(self.predict_glyphs(glyph_features(glyphs)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the kNN CAPTCHA classifier from harvested samples")
+    parser.add_argument("dataset", nargs="?", default=DEFAULT_DATASET_DIR)
+    parser.add_argument("model", nargs="?", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("-k", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    classifier = KNNCaptchaClassifier.train(CaptchaDataset(args.dataset), k=args.k)
+    classifier.save(args.model)
+    print(f"Trained on {len(classifier.labels)} glyphs "
+          f"({len(set(classifier.labels.tolist()))} classes), saved to {args.model}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
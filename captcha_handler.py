@@ -1,8 +1,14 @@
 import os
+import re
+import subprocess
 import sys
+import string
+import threading
+import numpy as np
 from PIL import Image
 from io import BytesIO
 import pytesseract
+from scrape_metrics import NULL_METRICS
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -16,26 +22,173 @@ def resource_path(relative_path):
 
 # Configure Tesseract path
 pytesseract.pytesseract.tesseract_cmd = resource_path(os.path.join("Tesseract-OCR", "tesseract.exe"))
+TESSDATA_DIR = resource_path(os.path.join("Tesseract-OCR", "tessdata"))
+
+# VTU CAPTCHAs are a single line of 6 alphanumeric characters
+CAPTCHA_LENGTH = 6
+CAPTCHA_WHITELIST = string.ascii_letters + string.digits
+PSM_SINGLE_LINE = 7
+# Config file in tessdata/configs setting the whitelist, for CLIs without -c (Tesseract < 3.05)
+WHITELIST_CONFIG = "vtu_captcha"
+
+
+def tesseract_version(cmd=None):
+    """(major, minor) of the tesseract binary, or None if it cannot be run.
+
+    Read directly rather than through pytesseract.get_tesseract_version, which
+    raises SystemExit for anything older than 3.05, such as the bundled 3.02.
+    """
+    try:
+        completed = subprocess.run([cmd or pytesseract.pytesseract.tesseract_cmd, "--version"],
+                                   capture_output=True, text=True, timeout=10,
+                                   creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"tesseract\s+v?(\d+)\.(\d+)", completed.stdout + completed.stderr)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+class PytesseractOCR:
+    """Runs one tesseract subprocess per CAPTCHA (the original behaviour)"""
+    name = "pytesseract"
+
+    def __init__(self, whitelist=CAPTCHA_WHITELIST, psm=PSM_SINGLE_LINE):
+        self.whitelist = whitelist
+        self.psm = psm
+        self._config = None
+
+    @property
+    def config(self):
+        if self._config is None:
+            # Tesseract < 3.05 (the bundled 3.02) has only -psm and no -c; the
+            # whitelist then comes from the WHITELIST_CONFIG file in tessdata/configs
+            version = tesseract_version()
+            if version is not None and version < (3, 5):
+                whitelist_config = f" {WHITELIST_CONFIG}" if self.whitelist == CAPTCHA_WHITELIST else ""
+                self._config = f"-psm {self.psm}{whitelist_config}"
+            else:
+                self._config = f"--psm {self.psm} -c tessedit_char_whitelist={self.whitelist}"
+        return self._config
+
+    def recognize(self, image):
+        return pytesseract.image_to_string(image, config=self.config)
+
+
+class TesserocrOCR:
+    """Keeps the tesseract engine loaded in-process through the tesserocr binding.
+
+    An engine is initialised once per thread (tesserocr API objects are not
+    thread-safe) and reused for every later CAPTCHA on that thread.
+    """
+    name = "tesserocr"
+
+    def __init__(self, whitelist=CAPTCHA_WHITELIST, psm=PSM_SINGLE_LINE, tessdata=None):
+        import tesserocr  # optional dependency
+
+        self._tesserocr = tesserocr
+        self.whitelist = whitelist
+        self.psm = psm
+        if tessdata is None and os.path.exists(os.path.join(TESSDATA_DIR, "eng.traineddata")):
+            tessdata = TESSDATA_DIR
+        self.tessdata = tessdata
+        self._local = threading.local()
+
+    def _api(self):
+        api = getattr(self._local, "api", None)
+        if api is None:
+            kwargs = {"path": self.tessdata} if self.tessdata else {}
+            api = self._tesserocr.PyTessBaseAPI(psm=self.psm, **kwargs)
+            api.SetVariable("tessedit_char_whitelist", self.whitelist)
+            self._local.api = api
+        return api
+
+    def recognize(self, image):
+        api = self._api()
+        api.SetImage(image)
+        return api.GetUTF8Text()
+
+
+def load_knn_classifier(model_path=None):
+    """Load the trained kNN classifier, with tesseract as fallback for unsegmentable images"""
+    from captcha_classifier import KNNCaptchaClassifier, DEFAULT_MODEL_PATH
+
+    return KNNCaptchaClassifier.load(model_path or DEFAULT_MODEL_PATH, fallback=make_ocr_backend("tesseract"))
+
+
+OCR_BACKENDS = {
+    PytesseractOCR.name: PytesseractOCR,
+    TesserocrOCR.name: TesserocrOCR,
+    "knn": load_knn_classifier,
+}
+
+
+def make_ocr_backend(name="auto"):
+    """Build an OCR backend by name.
+
+    "tesseract" prefers the persistent tesserocr engine over pytesseract;
+    "auto" additionally prefers the trained kNN classifier when its model
+    file is present. tesserocr is opt-in: it is not in requirements.txt and
+    the frozen exe excludes it, so there the pytesseract backend is used.
+    """
+    if name == "auto":
+        from captcha_classifier import DEFAULT_MODEL_PATH
+
+        if os.path.exists(DEFAULT_MODEL_PATH):
+            return load_knn_classifier()
+        name = "tesseract"
+    if name == "tesseract":
+        try:
+            return TesserocrOCR()
+        except Exception:
+            return PytesseractOCR()
+    return OCR_BACKENDS[name]()
+
 
 class CaptchaHandler:
     target_color = (102, 102, 102)
 
-    def get_captcha_from_image(self, target_image):
-        """Process CAPTCHA image and return text"""
+    def __init__(self, color_tolerance=0, ocr_backend="auto", dataset_dir=None, metrics=None):
+        # Max per-channel distance from target_color that still counts as text
+        self.color_tolerance = color_tolerance
+        self.metrics = metrics or NULL_METRICS
+        if isinstance(ocr_backend, str):
+            ocr_backend = make_ocr_backend(ocr_backend)
+        self.ocr = ocr_backend
+        self.dataset = None
+        if dataset_dir:
+            from captcha_classifier import CaptchaDataset
+
+            self.dataset = CaptchaDataset(dataset_dir)
+
+    def record_verified(self, target_image, captcha_text):
+        """Save a CAPTCHA the portal accepted, when harvesting is enabled"""
+        if self.dataset is None:
+            return
         try:
-            image_data = BytesIO(target_image)
-            image = Image.open(image_data).convert("RGB")
-            width, height = image.size
+            self.dataset.save(target_image, captcha_text)
+        except Exception as e:
+            print(f"CAPTCHA dataset write error: {e}")
 
-            white_image = Image.new("RGB", (width, height), "white")
+    def isolate_text(self, image):
+        """Keep only target-coloured pixels, painting everything else white"""
+        pixels = np.asarray(image.convert("RGB"))
+        if self.color_tolerance:
+            distance = np.abs(pixels.astype(np.int16) - np.array(self.target_color, dtype=np.int16))
+            mask = (distance <= self.color_tolerance).all(axis=-1)
+        else:
+            mask = (pixels == self.target_color).all(axis=-1)
 
-            for x in range(width):
-                for y in range(height):
-                    pixel = image.getpixel((x, y))
-                    if pixel == self.target_color:
-                        white_image.putpixel((x, y), pixel)
+        cleaned = np.full_like(pixels, 255)
+        cleaned[mask] = pixels[mask]
+        return Image.fromarray(cleaned)
 
-            return pytesseract.image_to_string(white_image).replace(" ", "").strip()
+    def get_captcha_from_image(self, target_image):
+        """Process CAPTCHA image and return text"""
+        try:
+            with self.metrics.timer("ocr"):
+                image = Image.open(BytesIO(target_image))
+                white_image = self.isolate_text(image)
+                return self.ocr.recognize(white_image).replace(" ", "").strip()
         except Exception as e:
             print(f"CAPTCHA processing error: {e}")
-            return ""
\ No newline at end of file
+            return ""
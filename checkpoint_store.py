@@ -0,0 +1,106 @@
+import json
+import os
+import threading
+
+from student_data import StudentRecord, SubjectResult
+
+
+class CheckpointStore:
+    """Append-only JSON-lines file of parsed students, kept next to the output.
+
+    Every USN is written as soon as it is fetched, so a crash or stop loses
+    nothing; a later run reads the file back, skips the stored USNs and
+    exports from it. A ``{"complete": true}`` line marks a run that finished
+    and was exported; a new scrape then starts the store afresh.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.usns = set()
+        self.complete = False
+        self._lock = threading.Lock()
+        self._file = None
+        self._load_index()
+
+    @staticmethod
+    def path_for(output_path):
+        return os.path.splitext(output_path)[0] + "_checkpoint.jsonl"
+
+    def _lines(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # torn last line from a crash mid-write
+
+    def _load_index(self):
+        for entry in self._lines():
+            if entry.get("complete"):
+                self.complete = True
+            elif "usn" in entry:
+                self.usns.add(entry["usn"])
+                self.complete = False
+
+    def __contains__(self, usn):
+        return usn.upper() in self.usns
+
+    def __len__(self):
+        return len(self.usns)
+
+    def add(self, usn, record):
+        """Append one fetched student and flush it to disk"""
+        line = json.dumps({"usn": usn.upper(), "info": record.info,
+                           "subjects": [list(subject) for subject in record.subjects]})
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.usns.add(usn.upper())
+            self.complete = False
+
+    def records(self):
+        """Stored (usn, StudentRecord) pairs, latest entry per USN, in first-stored order"""
+        latest = {}
+        for entry in self._lines():
+            if "usn" in entry:
+                latest[entry["usn"]] = entry
+        for usn, entry in latest.items():
+            yield usn, StudentRecord(entry["info"], [SubjectResult(*subject) for subject in entry["subjects"]])
+
+    def reset(self):
+        """Forget everything stored and start an empty checkpoint"""
+        with self._lock:
+            self._close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.usns = set()
+            self.complete = False
+
+    def mark_complete(self, records):
+        """Rewrite the store as exactly the exported ``(usn, record)`` pairs, marked complete"""
+        with self._lock:
+            self._close()
+            tmp_path = self.path + ".tmp"
+            usns = set()
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for usn, record in records:
+                    f.write(json.dumps({"usn": usn, "info": record.info,
+                                        "subjects": [list(subject) for subject in record.subjects]}) + "\n")
+                    usns.add(usn)
+                f.write(json.dumps({"complete": True}) + "\n")
+            os.replace(tmp_path, self.path)
+            self.usns = usns
+            self.complete = True
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        with self._lock:
+            self._close()
@@ -0,0 +1,114 @@
+import functools
+import json
+import os
+import threading
+
+
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".vtu_scraper", "chromedriver.json")
+# Set to 1 to never go online for a driver: use the cached one or let Selenium find one
+OFFLINE_ENV = "VTU_DRIVER_OFFLINE"
+
+_lock = threading.Lock()
+_resolved = {}  # Chrome version -> chromedriver path (None: lookup failed), shared by every driver in this process
+
+
+@functools.lru_cache(maxsize=None)
+def installed_chrome_version():
+    """Version of the installed Google Chrome, read locally from the OS (once per process), or None"""
+    try:
+        from webdriver_manager.core.utils import ChromeType, get_browser_version_from_os
+        return get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception:
+        return None
+
+
+def _read_cache(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(path, entries):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def resolve_chromedriver(offline=None, cache_path=CACHE_PATH):
+    """Path of a chromedriver for the installed Chrome, or None to let Selenium pick one.
+
+    Resolved paths are cached in ``cache_path`` by Chrome version, so
+    ChromeDriverManager (version lookups, possible downloads) only runs the
+    first time a Chrome version is seen. Within a process the answer is
+    resolved once under a lock and shared by every worker's driver. With
+    ``offline`` (default: the VTU_DRIVER_OFFLINE environment variable) the
+    network is never used; a cache miss returns None.
+
+    A failed lookup is remembered for the process and not retried. Once
+    Selenium has found a driver instead, remember_chromedriver stores it.
+    """
+    if offline is None:
+        offline = os.environ.get(OFFLINE_ENV, "") not in ("", "0")
+    with _lock:
+        version = installed_chrome_version()
+        if version in _resolved:
+            path = _resolved[version]
+            if path is None or os.path.isfile(path):
+                return path
+
+        entries = _read_cache(cache_path)
+        path = entries.get(version) if version else None
+        if path and os.path.isfile(path):
+            _resolved[version] = path
+            return path
+        if offline:
+            print(f"No cached chromedriver for Chrome {version or '(unknown)'}; offline mode, skipping download")
+            _resolved[version] = None
+            return None
+
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+        except Exception as e:
+            print(f"chromedriver lookup failed: {e}")
+            _resolved[version] = None
+            return None
+        _store(version, path, entries, cache_path)
+        return path
+
+
+def _store(version, path, entries, cache_path):
+    _resolved[version] = path
+    if version:
+        entries[version] = path
+        try:
+            _write_cache(cache_path, entries)
+        except OSError as e:
+            print(f"Could not save chromedriver cache: {e}")
+
+
+def remember_chromedriver(path, cache_path=CACHE_PATH):
+    """Cache a chromedriver that Selenium found itself, for the installed Chrome version"""
+    if not path or not os.path.isfile(path):
+        return
+    with _lock:
+        _store(installed_chrome_version(), path, _read_cache(cache_path), cache_path)
+
+
+def forget_chromedriver(path, cache_path=CACHE_PATH):
+    """Drop a chromedriver that failed to start from both caches"""
+    with _lock:
+        installed_chrome_version.cache_clear()  # Chrome may have been updated underneath us
+        for version in [version for version, cached in _resolved.items() if cached == path]:
+            del _resolved[version]
+        entries = _read_cache(cache_path)
+        kept = {version: cached for version, cached in entries.items() if cached != path}
+        if kept != entries:
+            try:
+                _write_cache(cache_path, kept)
+            except OSError:
+                pass
@@ -0,0 +1,79 @@
+import os
+
+import pandas as pd
+
+from excel_export import KEY_COLUMNS, iter_sheet_rows
+
+try:
+    import pyarrow  # noqa: F401  optional dependency, needed for Parquet
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+MARK_SUFFIXES = ("_InternalMarks", "_ExternalMarks", "_Total")
+MISSING_VALUES = ("", "NA")
+
+
+def columnar_path(output_path):
+    return os.path.splitext(output_path)[0] + ".parquet"
+
+
+def to_columnar_dtypes(df):
+    """Wide sheet with real dtypes: marks and Total_Full_Marks as Int64, "NA"/"" as missing.
+
+    A mark column that also holds non-numeric marks (e.g. "AB") is stored as
+    text instead, so nothing the Excel sheet keeps is lost; Parquet cannot
+    mix ints and strings in one column. The analyzer coerces marks itself.
+    """
+    df = df.mask(df.isin(MISSING_VALUES))
+    for name in df.columns:
+        is_marks = name == "Total_Full_Marks" or str(name).endswith(MARK_SUFFIXES)
+        numbers = pd.to_numeric(df[name], errors="coerce") if is_marks else None
+        if is_marks and numbers.notna().sum() == df[name].notna().sum():
+            df[name] = numbers.astype("Int64")
+        elif is_marks or df[name].dtype == object:
+            df[name] = df[name].map(lambda value: None if pd.isna(value) else str(value))
+    return df
+
+
+def upsert(old, new):
+    """Rows of ``new`` replace the rows of ``old`` with the same KEY_COLUMNS key, keeping
+    their position; the rest of ``new`` goes at the end (same order as excel_export)"""
+    key = [name for name in KEY_COLUMNS if name in old.columns and name in new.columns]
+    if not key:
+        return pd.concat([old, new], ignore_index=True)
+    new = new.drop_duplicates(key, keep="last")
+    old_keys = pd.MultiIndex.from_frame(old[key].astype(str).apply(lambda col: col.str.strip().str.upper()))
+    new_keys = pd.MultiIndex.from_frame(new[key].astype(str).apply(lambda col: col.str.strip().str.upper()))
+    positions = old_keys.get_indexer(new_keys)
+    order_new = positions.astype(float)
+    added = positions == -1
+    order_new[added] = len(old) + added.cumsum()[added]
+    kept = old.assign(_order=range(len(old)))[~old_keys.isin(new_keys)]
+    merged = pd.concat([kept, new.assign(_order=order_new)], ignore_index=True)
+    return merged.sort_values("_order", kind="stable").drop(columns="_order").reset_index(drop=True)
+
+
+def read_sheet(path):
+    """Whole first sheet of an Excel file as a DataFrame, streamed in read-only mode"""
+    rows = iter_sheet_rows(path)
+    header = next(rows)
+    return pd.DataFrame(list(rows), columns=list(header))
+
+
+def load_columnar(output_path):
+    """The Parquet copy of ``output_path`` if it exists and is not older than it, else None"""
+    path = columnar_path(output_path)
+    if not PARQUET_AVAILABLE or not os.path.exists(path):
+        return None
+    if os.path.exists(output_path) and os.stat(path).st_mtime_ns < os.stat(output_path).st_mtime_ns:
+        return None  # the Excel file was edited or re-exported without it
+    return pd.read_parquet(path)
+
+
+def write_columnar(output_path, df):
+    """Save ``df`` as the Parquet copy of ``output_path``; returns its path"""
+    path = columnar_path(output_path)
+    to_columnar_dtypes(df).to_parquet(path, index=False)
+    return path
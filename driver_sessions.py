@@ -0,0 +1,76 @@
+import threading
+
+
+class DriverCrashedError(Exception):
+    """Raised when the browser behind a WebDriver session has died (crashed renderer, closed window)"""
+
+
+def session_alive(driver):
+    """Health check: True if ``driver`` still answers a cheap WebDriver command"""
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+def quit_quietly(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class DriverSessionManager:
+    """Chrome sessions kept warm between scrape runs.
+
+    ``acquire`` hands out an idle session that passes the health check, or
+    starts a new one with ``factory(headless=...)`` (vtu_marks_scraper.get_driver
+    by default). ``release`` puts a live session back for the next run,
+    ``replace`` swaps a crashed one for a fresh one, and ``close_all`` quits
+    everything that is idle. Safe to share between worker threads.
+    """
+
+    def __init__(self, factory=None):
+        self.factory = factory
+        self._lock = threading.Lock()
+        self._idle = []  # (headless, driver)
+
+    def _start(self, headless):
+        factory = self.factory
+        if factory is None:
+            from vtu_marks_scraper import get_driver as factory
+        return factory(headless=headless)
+
+    def acquire(self, headless=True):
+        while True:
+            with self._lock:
+                index = next((i for i, (mode, _) in enumerate(self._idle) if mode == headless), None)
+                if index is None:
+                    break
+                _, driver = self._idle.pop(index)
+            if session_alive(driver):
+                return driver
+            quit_quietly(driver)
+        return self._start(headless)
+
+    def release(self, driver, headless=True):
+        if not session_alive(driver):
+            quit_quietly(driver)
+            return
+        with self._lock:
+            self._idle.append((headless, driver))
+
+    def replace(self, driver, headless=True):
+        """Quit a dead session and return a newly started one"""
+        quit_quietly(driver)
+        return self._start(headless)
+
+    def __len__(self):
+        return len(self._idle)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for _, driver in idle:
+            quit_quietly(driver)
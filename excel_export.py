@@ -0,0 +1,141 @@
+import os
+
+from openpyxl import Workbook, load_workbook
+
+
+USN_COLUMN = "University Seat Number"
+# Columns identifying one student result when appending (Semester only if the sheet has it)
+KEY_COLUMNS = (USN_COLUMN, "Semester")
+
+# path -> (mtime_ns, size, usns), so repeated "Retry Missing" checks skip the read
+_usn_cache = {}
+
+
+def read_usn_column(path, column=USN_COLUMN):
+    """Set of upper-cased USNs in the first sheet of an Excel file.
+
+    Only the USN column is streamed through openpyxl's read-only mode, and
+    the result is cached until the file changes.
+    """
+    stat = os.stat(path)
+    cached = _usn_cache.get(path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    workbook = load_workbook(path, read_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        header = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        if column not in header:
+            raise KeyError(column)
+        col = header.index(column) + 1
+        usns = {str(value).strip().upper()
+                for (value,) in sheet.iter_rows(min_row=2, min_col=col, max_col=col, values_only=True)
+                if value is not None}
+    finally:
+        workbook.close()
+
+    _usn_cache[path] = (stat.st_mtime_ns, stat.st_size, usns)
+    return usns
+
+
+def iter_sheet_rows(path):
+    """Yield the header tuple, then every row (padded to the header), of an Excel file's first sheet"""
+    workbook = load_workbook(path, read_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        while header and header[-1] is None:
+            header.pop()
+        yield tuple(header)
+        width = len(header)
+        for row in rows:
+            if any(value is not None for value in row):
+                yield tuple(row[:width]) + (None,) * (width - len(row))
+    finally:
+        workbook.close()
+
+
+def row_key(row, positions):
+    """Upsert key of a row: its key column values, normalised"""
+    return tuple(str(row[i]).strip().upper() if row[i] is not None else None for i in positions)
+
+
+def export_results(output_path, df, append=False):
+    """Write ``df`` to ``output_path`` through a write-only (streaming) workbook.
+
+    With ``append`` the rows already in ``output_path`` are streamed in first
+    and ``df``'s columns are added after the existing ones. Rows are upserted
+    on KEY_COLUMNS (USN, plus Semester when both sides have it): a row of
+    ``df`` replaces the existing row with the same key in place, and the
+    rest are added at the end. Memory stays proportional to ``df``, not to
+    the existing file. Returns the USNs written.
+    """
+    columns = list(df.columns)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    usns = []
+    tmp_path = output_path + ".tmp.xlsx"
+    try:
+        if append and os.path.exists(output_path):
+            rows = iter_sheet_rows(output_path)
+            old_columns = list(next(rows))
+            header = old_columns + [name for name in columns if name not in old_columns]
+        else:
+            rows = iter(())
+            old_columns = []
+            header = columns
+        sheet.append(header)
+        usn_at = header.index(USN_COLUMN) if USN_COLUMN in header else None
+
+        # Index the new batch by key; a later row for the same key wins
+        key_columns = [name for name in KEY_COLUMNS if name in columns and (not old_columns or name in old_columns)]
+        new_key_positions = [columns.index(name) for name in key_columns]
+        positions = [header.index(name) for name in columns]
+        new_rows = {}
+        for row in df.itertuples(index=False, name=None):
+            out = [None] * len(header)
+            for position, value in zip(positions, row):
+                out[position] = value
+            new_rows[row_key(row, new_key_positions) if key_columns else len(new_rows)] = out
+
+        old_key_positions = [old_columns.index(name) for name in key_columns if old_columns]
+        padding = (None,) * (len(header) - len(old_columns))
+        for row in rows:
+            replacement = new_rows.pop(row_key(row, old_key_positions), None) if key_columns else None
+            out = replacement if replacement is not None else row + padding
+            sheet.append(out)
+            if usn_at is not None:
+                usns.append(out[usn_at])
+
+        for row in new_rows.values():
+            sheet.append(row)
+            if usn_at is not None:
+                usns.append(row[usn_at])
+
+        workbook.save(tmp_path)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return usns
+
+
+def usn_index_path(output_path):
+    return os.path.splitext(output_path)[0] + "_usns.txt"
+
+
+def write_usn_index(output_path, usns):
+    """Write the sidecar list of USNs saved in ``output_path``, one per line"""
+    with open(usn_index_path(output_path), "w", encoding="utf-8") as f:
+        f.writelines(f"{str(usn).strip().upper()}\n" for usn in usns)
+
+
+def fetched_usns(output_path):
+    """USNs saved in an output file, from its sidecar index if that is up to date"""
+    index_path = usn_index_path(output_path)
+    if (os.path.exists(index_path)
+            and os.stat(index_path).st_mtime_ns >= os.stat(output_path).st_mtime_ns):
+        with open(index_path, "r", encoding="utf-8") as f:
+            return {line.strip() for line in f if line.strip()}
+    return read_usn_column(output_path)
@@ -0,0 +1,136 @@
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+
+
+TRANSIENT = "transient"   # network trouble or an overloaded portal: back off and retry
+CAPTCHA = "captcha"       # wrong or unreadable CAPTCHA: retry straight away
+PERMANENT = "permanent"   # retrying this USN cannot help
+
+# Selenium errors meaning the browser session itself is gone (matched by name so
+# this module does not pull in selenium for the HTTP engines)
+PERMANENT_DRIVER_ERRORS = {"InvalidSessionIdException", "NoSuchWindowException"}
+
+
+class ErrorBudget:
+    """Run-wide budget of transient errors shared by every worker.
+
+    When ``max_errors`` transient errors land within ``window`` seconds the
+    portal is treated as degraded and every worker pauses for ``pause``
+    seconds before its next attempt.
+    """
+
+    def __init__(self, max_errors=20, window=60.0, pause=60.0, on_pause=None):
+        self.max_errors = max_errors
+        self.window = window
+        self.pause = pause
+        self.on_pause = on_pause
+        self._lock = threading.Lock()
+        self._errors = deque()
+        self._paused_until = 0.0
+
+    def record_error(self):
+        now = time.monotonic()
+        with self._lock:
+            self._errors.append(now)
+            while self._errors and self._errors[0] < now - self.window:
+                self._errors.popleft()
+            if len(self._errors) < self.max_errors or now < self._paused_until:
+                return
+            self._errors.clear()
+            self._paused_until = now + self.pause
+        if self.on_pause:
+            self.on_pause(self.pause)
+
+    def pause_remaining(self):
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def wait_if_paused(self, stop_event=None):
+        """Block while the run is paused; returns early if ``stop_event`` is set"""
+        remaining = self.pause_remaining()
+        while remaining > 0:
+            if stop_event is not None:
+                if stop_event.wait(min(remaining, 1.0)):
+                    return
+            else:
+                time.sleep(min(remaining, 1.0))
+            remaining = self.pause_remaining()
+
+
+class RetryPolicy:
+    """How hard to try each USN, and how long to wait between tries.
+
+    Each USN gets its own budget of attempts, CAPTCHA misses and transient
+    errors (see ``start``). Transient errors back off exponentially with full
+    jitter and are also charged to the shared ErrorBudget.
+    """
+
+    def __init__(self, max_attempts=50, max_captcha_misses=30, max_transient_errors=6,
+                 base_delay=1.0, max_delay=30.0, error_budget=None):
+        self.max_attempts = max_attempts
+        self.max_captcha_misses = max_captcha_misses
+        self.max_transient_errors = max_transient_errors
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.error_budget = error_budget or ErrorBudget()
+
+    @staticmethod
+    def classify(error):
+        """Classify a portal alert text or an exception as TRANSIENT, CAPTCHA or PERMANENT"""
+        if isinstance(error, str):
+            if "Invalid captcha code" in error:
+                return CAPTCHA
+            if "University Seat Number is not available or Invalid" in error:
+                return PERMANENT
+            return TRANSIENT
+        if type(error).__name__ in PERMANENT_DRIVER_ERRORS:
+            return PERMANENT
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            status = error.response.status_code
+            if 400 <= status < 500 and status not in (408, 429):
+                return PERMANENT
+        return TRANSIENT
+
+    def backoff_delay(self, failures):
+        """Full-jitter exponential backoff for the n-th consecutive transient failure"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (failures - 1)))
+
+    def start(self, usn):
+        return RetryState(self, usn)
+
+
+class RetryState:
+    """Per-USN retry budget handed out by RetryPolicy.start"""
+
+    def __init__(self, policy, usn):
+        self.policy = policy
+        self.usn = usn
+        self.attempt = 1
+        self.captcha_misses = 0
+        self.transient_errors = 0
+
+    def exhausted(self):
+        policy = self.policy
+        return (self.attempt > policy.max_attempts
+                or self.captcha_misses >= policy.max_captcha_misses
+                or self.transient_errors >= policy.max_transient_errors)
+
+    def captcha_miss(self):
+        self.captcha_misses += 1
+        self.attempt += 1
+
+    def transient_error(self):
+        """Count a transient failure and return how long to back off before retrying"""
+        self.transient_errors += 1
+        self.attempt += 1
+        self.policy.error_budget.record_error()
+        return self.policy.backoff_delay(self.transient_errors)
+
+    def wait(self, delay, stop_event=None):
+        if stop_event is not None:
+            stop_event.wait(delay)
+        else:
+            time.sleep(delay)
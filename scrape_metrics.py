@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ScrapeMetrics:
+    """Thread-safe counters and timers collected over one scrape run.
+
+    Timers: ``ocr``, ``page_load``, ``captcha_fetch``, ``submit_to_result``.
+    Counters: ``captcha_length_rejects``, ``captcha_server_rejects``,
+    ``invalid_usn``, ``errors``. Per-USN attempt counts go through
+    ``record_usn``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.counters = {}
+        self.timers = {}
+        self.attempts = {}
+        self.outcomes = {}
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, seconds):
+        with self._lock:
+            self.timers.setdefault(name, []).append(seconds)
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def record_usn(self, usn, attempts, outcome):
+        """Record how many attempts a USN took and how it ended (fetched/invalid/failed)"""
+        with self._lock:
+            self.attempts[usn] = attempts
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    def summary(self):
+        with self._lock:
+            timers = {}
+            for name, values in self.timers.items():
+                ordered = sorted(values)
+                timers[name] = {
+                    "count": len(ordered),
+                    "total_s": round(sum(ordered), 3),
+                    "mean_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+                    "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 1),
+                    "max_ms": round(ordered[-1] * 1000, 1),
+                }
+            attempts = list(self.attempts.values())
+            return {
+                "wall_clock_s": round(time.time() - self.started, 1),
+                "usns": len(attempts),
+                "outcomes": dict(self.outcomes),
+                "attempts_per_usn": {
+                    "mean": round(sum(attempts) / len(attempts), 2) if attempts else 0,
+                    "max": max(attempts) if attempts else 0,
+                },
+                "counters": dict(self.counters),
+                "timers": timers,
+            }
+
+    def to_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def format_summary(self):
+        """Short multi-line text for the GUI statistics panel"""
+        summary = self.summary()
+        counters = summary["counters"]
+        lines = [
+            f"USNs: {summary['usns']}  {', '.join(f'{k}: {v}' for k, v in summary['outcomes'].items())}"
+            f"  |  attempts/USN: {summary['attempts_per_usn']['mean']} (max {summary['attempts_per_usn']['max']})",
+            f"CAPTCHA rejects - length: {counters.get('captcha_length_rejects', 0)}"
+            f"  server: {counters.get('captcha_server_rejects', 0)}"
+            f"  |  errors: {counters.get('errors', 0)}",
+        ]
+        timings = [f"{name}: {t['mean_ms']:.0f} ms avg / {t['total_s']:.0f} s"
+                   for name, t in summary["timers"].items()]
+        if timings:
+            lines.append("  |  ".join(timings))
+        return "\n".join(lines)
+
+
+class NullMetrics(ScrapeMetrics):
+    """Drop-in ScrapeMetrics that records nothing"""
+
+    def incr(self, name, amount=1):
+        pass
+
+    def observe(self, name, seconds):
+        pass
+
+    def record_usn(self, usn, attempts, outcome):
+        pass
+
+
+NULL_METRICS = NullMetrics()
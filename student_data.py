@@ -56,65 +56,291 @@ def parse_student_result(html_path):
         return pd.DataFrame()
 '''
 
+import threading
+from collections import namedtuple
+from dataclasses import dataclass
+
 from bs4 import BeautifulSoup
 import pandas as pd
 
+try:
+    from lxml import etree
+except ImportError:  # bs4 engine only
+    etree = None
 
-def parse_student_result(html_path):
-    """Parse student result HTML and return DataFrame"""
+
+PARSER_ENGINES = ("lxml", "bs4")
+DEFAULT_ENGINE = "lxml" if etree is not None else "bs4"
+
+SubjectResult = namedtuple("SubjectResult",
+                           ["code", "name", "internal", "external", "total", "result", "updated_on"])
+
+# Wide column suffix for each SubjectResult field, giving "{code}_{suffix}"
+SUBJECT_COLUMNS = (
+    ("name", "SubjectName"),
+    ("internal", "InternalMarks"),
+    ("external", "ExternalMarks"),
+    ("total", "Total"),
+    ("result", "Result"),
+    ("updated_on", "UpdatedOn"),
+)
+
+
+@dataclass
+class StudentRecord:
+    """One student's result: the info table plus a SubjectResult per subject row.
+
+    Marks are ints wherever the portal printed a number.
+    """
+    __slots__ = ("info", "subjects")
+    info: dict
+    subjects: list
+
+    @property
+    def total_full_marks(self):
+        return sum(subject.total for subject in self.subjects if isinstance(subject.total, int))
+
+    def to_row(self):
+        """Flat wide row: info fields, then {code}_{field} per subject, then Total_Full_Marks"""
+        row = dict(self.info)
+        for subject in self.subjects:
+            for field, suffix in SUBJECT_COLUMNS:
+                row[f"{subject.code}_{suffix}"] = getattr(subject, field)
+        row["Total_Full_Marks"] = self.total_full_marks
+        return row
+
+
+def _mark(text):
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+
+def records_to_dataframe(records):
+    """Build one wide DataFrame from StudentRecords in a single pass.
+
+    Columns appear in the order they are first seen; cells for subjects a
+    student did not take are left empty (None).
+    """
+    records = list(records)
+    columns = {}
+    for i, record in enumerate(records):
+        for name, value in record.to_row().items():
+            column = columns.get(name)
+            if column is None:
+                column = columns[name] = [None] * len(records)
+            column[i] = value
+    # Columns with gaps stay object so marks remain ints instead of becoming floats
+    return pd.DataFrame({name: values if None not in values else pd.Series(values, dtype=object)
+                         for name, values in columns.items()})
+
+
+# Long (tidy) layout: the student's info columns, then one row per subject taken
+LONG_SUBJECT_COLUMNS = ["SubjectCode"] + [suffix for _, suffix in SUBJECT_COLUMNS]
+LONG_MARK_COLUMNS = ["InternalMarks", "ExternalMarks", "Total"]
+MISSING_VALUES = ("", "NA")
+
+
+def _with_mark_dtypes(long_df):
+    """Marks as nullable integers. A column that also holds non-numeric marks
+    (e.g. "AB") keeps them as strings next to int marks, as the wide sheet does"""
+    for name in LONG_MARK_COLUMNS:
+        values = long_df[name].mask(long_df[name].isin(MISSING_VALUES))
+        numbers = pd.to_numeric(values, errors="coerce")
+        if numbers.notna().sum() == values.notna().sum():
+            long_df[name] = numbers.astype("Int64")
+        else:
+            long_df[name] = pd.Series([int(number) if pd.notna(number) else value if pd.notna(value) else None
+                                       for number, value in zip(numbers, values)],
+                                      index=long_df.index, dtype=object)
+    return long_df
+
+
+def records_to_long(records):
+    """Build the long DataFrame, one row per (student, subject), from StudentRecords"""
+    pairs = [(record.info, subject) for record in records for subject in record.subjects]
+    info_columns = list(dict.fromkeys(key for record in records for key in record.info))
+    data = {key: [info.get(key) for info, _ in pairs] for key in info_columns}
+    fields = list(zip(*(subject for _, subject in pairs))) or [()] * len(LONG_SUBJECT_COLUMNS)
+    data.update(zip(LONG_SUBJECT_COLUMNS, (list(values) for values in fields)))
+    return _with_mark_dtypes(pd.DataFrame(data))
+
+
+def wide_to_long(df):
+    """Convert the wide {code}_{field} sheet to the long layout.
+
+    Subjects are found from their ``{code}_Total`` column; a student only
+    gets a row for a subject if one of its cells is filled (not empty/"NA").
+    """
+    codes = [name[:-len("_Total")] for name in df.columns if name.endswith("_Total")]
+    subject_columns = {f"{code}_{suffix}" for code in codes for _, suffix in SUBJECT_COLUMNS}
+    id_columns = [name for name in df.columns if name not in subject_columns and name != "Total_Full_Marks"]
+
+    parts = []
+    for code in codes:
+        part = df[id_columns].copy()
+        part["SubjectCode"] = code
+        taken = pd.Series(False, index=df.index)
+        for _, suffix in SUBJECT_COLUMNS:
+            column = f"{code}_{suffix}"
+            values = df[column] if column in df.columns else pd.Series(None, index=df.index, dtype=object)
+            part[suffix] = values
+            taken |= values.notna() & ~values.isin(MISSING_VALUES)
+        parts.append(part[taken])
+
+    if not parts:
+        return _with_mark_dtypes(pd.DataFrame(columns=id_columns + LONG_SUBJECT_COLUMNS))
+    # Back to student order, keeping each student's subjects in sheet order
+    long_df = pd.concat(parts).sort_index(kind="stable").reset_index(drop=True)
+    return _with_mark_dtypes(long_df)
+
+
+def long_to_wide(long_df, id_column="University Seat Number"):
+    """Convert the long layout back to one wide row per student, with Total_Full_Marks"""
+    long_df = long_df.drop_duplicates([id_column, "SubjectCode"], keep="last")
+    info_columns = [name for name in long_df.columns if name not in LONG_SUBJECT_COLUMNS]
+    info = long_df[info_columns].drop_duplicates(id_column).set_index(id_column)
+
+    fields = [suffix for _, suffix in SUBJECT_COLUMNS]
+    codes = long_df["SubjectCode"].unique()
+    marks = long_df.set_index([id_column, "SubjectCode"])[fields].unstack("SubjectCode")
+    marks = marks.reindex(index=info.index,
+                          columns=pd.MultiIndex.from_tuples([(f, c) for c in codes for f in fields]))
+    # Only numeric totals count, like StudentRecord.total_full_marks
+    total_full = marks["Total"].apply(pd.to_numeric, errors="coerce").sum(axis=1).astype("int64") if len(codes) else 0
+    marks.columns = [f"{code}_{field}" for field, code in marks.columns]
+
+    wide = info.join(marks)
+    wide["Total_Full_Marks"] = total_full
+    return wide.reset_index()
+
+
+def read_long_csv(path):
+    """Load a long-format CSV written by the scraper, restoring the mark dtypes"""
+    return _with_mark_dtypes(pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[""]))
+
+
+def parse_student_result(html_path, engine=None):
+    """Parse a saved student result HTML file and return DataFrame"""
     try:
         with open(html_path, "r", encoding="utf-8") as f:
             student_html = f.read()
+    except Exception as e:
+        print(f"Error reading student data: {e}")
+        return pd.DataFrame()
+    return parse_student_html(student_html, engine=engine)
 
-        soup = BeautifulSoup(student_html, "html.parser")
 
-        # Step 1: Extract Student Info
-        student_info = {}
-        rows = soup.select("table.table-bordered tr")
-        for row in rows:
-            cells = row.find_all("td")
-            if len(cells) == 2:
-                key = cells[0].get_text(strip=True).replace(":", "")
-                value = cells[1].get_text(strip=True).replace(":", "")
-                student_info[key] = value
+def parse_student_html(student_html, engine=None):
+    """Parse student result HTML (str or bytes) and return a one-row DataFrame"""
+    record = parse_student_record(student_html, engine=engine)
+    if record is None:
+        return pd.DataFrame()
+    return records_to_dataframe([record])
 
-        # Step 2: Extract Subject Results
-        subject_rows = soup.select(".divTableRow")[1:]  # Skip header
-        subject_data = {}
-        total_full = 0
 
-        for row in subject_rows:
-            cells = row.select(".divTableCell")
+def parse_student_record(student_html, engine=None):
+    """Parse student result HTML (str or bytes) into a StudentRecord, or None on error.
+
+    ``engine`` is "lxml" (compiled XPath, the default when lxml is installed)
+    or "bs4" (BeautifulSoup with html.parser); both give the same record.
+    """
+    engine = engine or DEFAULT_ENGINE
+    if engine not in PARSER_ENGINES:
+        raise ValueError(f"Unknown parser engine: {engine}")
+    try:
+        if engine == "lxml":
+            student_info, subject_rows = _extract_lxml(student_html)
+        else:
+            student_info, subject_rows = _extract_bs4(student_html)
+
+        # Step 2: Extract Subject Results
+        subjects = []
+        for cells in subject_rows:
             if len(cells) >= 7:
-                code = cells[0].get_text(strip=True)
+                code = cells[0]
 
                 # Skip if the code is just a header like "Subject Code"
                 if code.lower() == "subject code":
                     continue
 
-                subject_data.update({
-                    f"{code}_SubjectName": cells[1].get_text(strip=True),
-                    f"{code}_InternalMarks": cells[2].get_text(strip=True),
-                    f"{code}_ExternalMarks": cells[3].get_text(strip=True),
-                    f"{code}_Total": cells[4].get_text(strip=True),
-                    f"{code}_Result": cells[5].get_text(strip=True),
-                    f"{code}_UpdatedOn": cells[6].get_text(strip=True),
-                })
+                subjects.append(SubjectResult(code, cells[1], _mark(cells[2]), _mark(cells[3]),
+                                              _mark(cells[4]), cells[5], cells[6]))
 
-                try:
-                    full = int(cells[4].get_text(strip=True))
-                    total_full += full
-                except ValueError:
-                    pass
-
-        # Step 3: Merge into one flat row
-        flat_row = {**student_info, **subject_data}
-        flat_row["Total_Full_Marks"] = total_full
-        df = pd.DataFrame([flat_row]).fillna("")
-        # Step 4: Create DataFrame
-        return df
+        return StudentRecord(student_info, subjects)
     except Exception as e:
         print(f"Error parsing student data: {e}")
-        return pd.DataFrame()
+        return None
+
+
+def _extract_bs4(student_html):
+    """Student info dict and subject row cell texts, via BeautifulSoup"""
+    if isinstance(student_html, bytes):
+        student_html = student_html.decode("utf-8")
+
+    soup = BeautifulSoup(student_html, "html.parser")
+
+    # Step 1: Extract Student Info
+    student_info = {}
+    for row in soup.select("table.table-bordered tr"):
+        cells = row.find_all("td")
+        if len(cells) == 2:
+            key = cells[0].get_text(strip=True).replace(":", "")
+            value = cells[1].get_text(strip=True).replace(":", "")
+            student_info[key] = value
+
+    subject_rows = [[cell.get_text(strip=True) for cell in row.select(".divTableCell")]
+                    for row in soup.select(".divTableRow")[1:]]  # Skip header
+    return student_info, subject_rows
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_lxml_local = threading.local()
+
+
+def _lxml_tools():
+    """Per-thread HTML parser and compiled XPath expressions (neither is shared across threads)"""
+    tools = getattr(_lxml_local, "tools", None)
+    if tools is None:
+        tools = _lxml_local.tools = {
+            "parser": etree.HTMLParser(encoding="utf-8"),
+            "info_rows": etree.XPath(f"//table[{_has_class('table-bordered')}]//tr"),
+            "tds": etree.XPath(".//td"),
+            "subject_rows": etree.XPath(f"//*[{_has_class('divTableRow')}]"),
+            "cells": etree.XPath(f".//*[{_has_class('divTableCell')}]"),
+            # get_text() leaves out comments and script/style/template content
+            "texts": etree.XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template)]"),
+        }
+    return tools
+
+
+def _extract_lxml(student_html):
+    """Student info dict and subject row cell texts, via lxml and compiled XPath"""
+    if isinstance(student_html, str):
+        student_html = student_html.encode("utf-8")
+    tools = _lxml_tools()
+    root = etree.fromstring(student_html, tools["parser"]) if student_html.strip() else None
+    if root is None:
+        return {}, []
+
+    texts = tools["texts"]
+
+    def get_text(element):
+        # Same as bs4's get_text(strip=True): strip each text node and join
+        return "".join(text.strip() for text in texts(element))
 
+    student_info = {}
+    for row in tools["info_rows"](root):
+        cells = tools["tds"](row)
+        if len(cells) == 2:
+            key = get_text(cells[0]).replace(":", "")
+            value = get_text(cells[1]).replace(":", "")
+            student_info[key] = value
 
+    subject_rows = [[get_text(cell) for cell in tools["cells"](row)]
+                    for row in tools["subject_rows"](root)[1:]]  # Skip header
+    return student_info, subject_rows
@@ -0,0 +1,62 @@
+"""Throughput of the asyncio scraper against the local mock portal.
+
+    python tools/bench_async_scraper.py --usns 200 --latency 0.05 --levels 1 4 16 64
+
+OCR is replaced by a fixed answer (the mock portal is started with
+``accept_any_captcha``) so the numbers isolate network/pipeline cost.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_portal import start_mock_portal  # noqa: E402
+from vtu_async_scraper import run_async_scraper  # noqa: E402
+
+
+class FixedAnswerCaptcha:
+    def get_captcha_from_image(self, target_image):
+        return "ABCDEF"
+
+    def record_verified(self, target_image, captcha_text):
+        pass
+
+
+def bench(base_url, usn_list, concurrency, rate):
+    fetched = []
+
+    def on_result(index, usn, html):
+        if html is not None:
+            fetched.append(usn)
+
+    start = time.perf_counter()
+    run_async_scraper(usn_list, FixedAnswerCaptcha(), base_url, on_result, concurrency=concurrency, rate=rate)
+    elapsed = time.perf_counter() - start
+    return len(fetched), elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--usns", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock portal delay per request (s)")
+    parser.add_argument("--rate", type=float, default=0, help="Requests/s per host, 0 for unlimited")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args(argv)
+
+    server = start_mock_portal(students=args.usns, latency=args.latency, accept_any_captcha=True)
+    usn_list = [f"1CR24BA{str(i).zfill(3)}" for i in range(1, args.usns + 1)]
+    try:
+        print(f"{'concurrency':>11} {'fetched':>8} {'seconds':>8} {'usn/s':>8}")
+        for level in args.levels:
+            fetched, elapsed = bench(server.base_url, usn_list, level, args.rate)
+            print(f"{level:>11} {fetched:>8} {elapsed:>8.2f} {fetched / elapsed:>8.1f}")
+    finally:
+        server.shutdown()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Compare the per-pixel CAPTCHA masking loop with CaptchaHandler.isolate_text.
+
+    python tools/bench_captcha_mask.py [captcha_png_dir] --repeat 20
+
+Without a directory, CAPTCHAs are synthesised with the mock portal renderer.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from captcha_handler import CaptchaHandler  # noqa: E402
+from mock_portal import render_captcha  # noqa: E402
+
+
+def legacy_isolate_text(image, target_color=CaptchaHandler.target_color):
+    """The original getpixel/putpixel loop, kept here as the reference"""
+    image = image.convert("RGB")
+    width, height = image.size
+    white_image = Image.new("RGB", (width, height), "white")
+    for x in range(width):
+        for y in range(height):
+            pixel = image.getpixel((x, y))
+            if pixel == target_color:
+                white_image.putpixel((x, y), pixel)
+    return white_image
+
+
+def load_samples(directory, count):
+    if directory:
+        paths = sorted(glob.glob(os.path.join(directory, "*.png")))
+        return [open(path, "rb").read() for path in paths]
+    return [render_captcha(f"{i:06d}", seed=i) for i in range(count)]
+
+
+def timed(func, images, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for image in images:
+            func(image)
+    return (time.perf_counter() - start) / (repeat * len(images))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?")
+    parser.add_argument("--samples", type=int, default=20, help="Synthetic samples when no directory is given")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    images = [Image.open(BytesIO(data)).convert("RGB") for data in load_samples(args.directory, args.samples)]
+    if not images:
+        print("No CAPTCHA images found")
+        return 1
+
+    handler = CaptchaHandler()
+    mismatches = sum(
+        not np.array_equal(np.asarray(legacy_isolate_text(image)), np.asarray(handler.isolate_text(image)))
+        for image in images
+    )
+
+    legacy = timed(legacy_isolate_text, images, args.repeat)
+    vectorized = timed(handler.isolate_text, images, args.repeat)
+    print(f"images: {len(images)}  size: {images[0].size}  mismatches: {mismatches}")
+    print(f"legacy loop:  {legacy * 1000:8.3f} ms/image")
+    print(f"vectorized:   {vectorized * 1000:8.3f} ms/image")
+    print(f"speedup:      {legacy / vectorized:8.1f}x")
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
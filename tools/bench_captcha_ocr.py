@@ -0,0 +1,73 @@
+"""Solve latency and accuracy of each CAPTCHA OCR backend on a stored corpus.
+
+    python tools/bench_captcha_ocr.py path/to/corpus --backends pytesseract tesserocr
+
+The corpus is a directory of PNGs named after their answer, optionally with
+a suffix after an underscore (``A7K2QX.png``, ``A7K2QX_0193.png``).
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from captcha_handler import CaptchaHandler, OCR_BACKENDS, CAPTCHA_LENGTH  # noqa: E402
+
+
+def load_corpus(directory):
+    samples = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.png"))):
+        answer = os.path.splitext(os.path.basename(path))[0].split("_")[0]
+        with open(path, "rb") as f:
+            samples.append((answer, f.read()))
+    return samples
+
+
+def evaluate(handler, samples):
+    latencies = []
+    correct = length_ok = 0
+    for answer, data in samples:
+        start = time.perf_counter()
+        guess = handler.get_captcha_from_image(data)
+        latencies.append(time.perf_counter() - start)
+        correct += guess == answer
+        length_ok += len(guess) == CAPTCHA_LENGTH
+    latencies.sort()
+    return {
+        "accuracy": correct / len(samples),
+        "length_ok": length_ok / len(samples),
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus")
+    parser.add_argument("--backends", nargs="+", default=list(OCR_BACKENDS))
+    args = parser.parse_args(argv)
+
+    samples = load_corpus(args.corpus)
+    if not samples:
+        print(f"No PNG samples found in {args.corpus}")
+        return 1
+
+    print(f"{len(samples)} samples")
+    print(f"{'backend':>12} {'accuracy':>9} {'len ok':>7} {'mean ms':>8} {'p95 ms':>8}")
+    for name in args.backends:
+        try:
+            handler = CaptchaHandler(ocr_backend=name)
+        except Exception as e:
+            print(f"{name:>12} unavailable: {e}")
+            continue
+        stats = evaluate(handler, samples)
+        print(f"{name:>12} {stats['accuracy']:>9.1%} {stats['length_ok']:>7.1%} "
+              f"{stats['mean_ms']:>8.1f} {stats['p95_ms']:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Speed of ResultAnalyzer._identify_failed_students against the old row loop.
+
+    python tools/bench_failed_students.py --students 10000 --subjects 12
+
+Builds a synthetic results sheet (P/F/A/AB text results with some blanks,
+plus one numeric result column) and checks both versions return the same list.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from Analyzer import ResultAnalyzer  # noqa: E402
+
+
+def legacy_identify_failed_students(df, result_columns):
+    """The original iterrows implementation, kept as the reference"""
+    failed_students = []
+    for _, student in df.iterrows():
+        failed_subjects = []
+        for result_col in result_columns:
+            result = student.get(result_col)
+            if pd.notna(result) and isinstance(result, str):
+                if result.strip().lower() in ['f', 'fail', 'failed', 'ab', 'absent']:
+                    failed_subjects.append(result_col.replace('_Result', ''))
+            elif pd.notna(result) and isinstance(result, (int, float)):
+                if result < 35:
+                    failed_subjects.append(result_col.replace('_Result', ''))
+        if failed_subjects:
+            failed_students.append({
+                'Student Name': student.get('Student Name', ''),
+                'University Seat Number': student.get('University Seat Number', ''),
+                'Failed Subjects': ', '.join(failed_subjects),
+                'Total Failed Subjects': len(failed_subjects)
+            })
+    return failed_students, len(df)
+
+
+def synthetic_sheet(students, subjects, seed=0):
+    rng = random.Random(seed)
+    data = {
+        'University Seat Number': [f"1AB24CS{i:05d}" for i in range(students)],
+        'Student Name': [f"STUDENT {i}" for i in range(students)],
+    }
+    for j in range(subjects):
+        data[f"SUB{j:02d}_Result"] = [rng.choice(["P"] * 40 + [" F", "A", "AB", "fail", None])
+                                      for _ in range(students)]
+    data["NUM00_Result"] = [rng.choice([20, 40, 80, None]) for _ in range(students)]
+    return pd.DataFrame(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--subjects", type=int, default=12)
+    args = parser.parse_args(argv)
+
+    analyzer = ResultAnalyzer("synthetic.xlsx")
+    analyzer.df_clean = synthetic_sheet(args.students, args.subjects)
+    analyzer.result_columns = [col for col in analyzer.df_clean.columns if col.endswith('_Result')]
+
+    start = time.perf_counter()
+    expected = legacy_identify_failed_students(analyzer.df_clean, analyzer.result_columns)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = analyzer._identify_failed_students()
+    vectorized = time.perf_counter() - start
+
+    print(f"{args.students} students x {len(analyzer.result_columns)} result columns, "
+          f"{len(expected[0])} failed")
+    print(f"iterrows:   {legacy * 1000:9.1f} ms")
+    print(f"vectorized: {vectorized * 1000:9.1f} ms  ({legacy / vectorized:.0f}x)")
+    print("identical output" if actual == expected else "OUTPUT DIFFERS")
+    return 0 if actual == expected else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
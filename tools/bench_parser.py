@@ -0,0 +1,62 @@
+"""Pages per second of the student_data parser engines.
+
+    python tools/bench_parser.py --corpus saved_results/ --repeat 5
+
+The corpus is a directory of saved result pages (*.html). Without one, pages
+rendered by the mock portal are used. Every page is also checked to give the
+same row with both engines.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_portal import render_result  # noqa: E402
+from student_data import PARSER_ENGINES, parse_student_html  # noqa: E402
+
+
+def load_corpus(corpus_dir, pages):
+    if corpus_dir:
+        corpus = []
+        for path in sorted(glob.glob(os.path.join(corpus_dir, "*.html"))):
+            with open(path, "r", encoding="utf-8") as f:
+                corpus.append(f.read())
+        return corpus
+    return [render_result(f"1CR24BA{str(i).zfill(3)}") for i in range(1, pages + 1)]
+
+
+def bench(corpus, engine, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in corpus:
+            parse_student_html(page, engine=engine)
+    return len(corpus) * repeat / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of saved result pages (*.html)")
+    parser.add_argument("--pages", type=int, default=200, help="Mock pages to render when no corpus is given")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus, args.pages)
+    if not corpus:
+        print("No pages to parse")
+        return 1
+
+    mismatches = sum(not parse_student_html(page, engine="lxml").equals(parse_student_html(page, engine="bs4"))
+                     for page in corpus)
+    print(f"{len(corpus)} pages, {mismatches} with differing rows between engines")
+
+    print(f"{'engine':>8} {'pages/s':>10}")
+    for engine in PARSER_ENGINES:
+        print(f"{engine:>8} {bench(corpus, engine, args.repeat):>10.1f}")
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Time ResultAnalyzer.generate_report on synthetic cohorts of growing size.
+
+    python tools/bench_report.py --students 1000 4000 16000 --subjects 12
+
+Marks are drawn from a narrow range so many students tie for the top of each
+subject, which makes the top-performer table large. Time should grow
+roughly linearly with the number of students.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from Analyzer import ResultAnalyzer  # noqa: E402
+
+
+def synthetic_cohort(students, subjects, seed=0):
+    rng = random.Random(seed)
+    data = {
+        'University Seat Number': [f"1AB24CS{i:05d}" for i in range(students)],
+        'Student Name': [f"STUDENT {i}" for i in range(students)],
+    }
+    for j in range(subjects):
+        code = f"SUB{j:02d}"
+        internal = [rng.randint(45, 50) for _ in range(students)]
+        external = [rng.choice([15, 40, 50]) for _ in range(students)]
+        data[f"{code}_SubjectName"] = [f"SUBJECT {j}"] * students
+        data[f"{code}_InternalMarks"] = internal
+        data[f"{code}_ExternalMarks"] = external
+        data[f"{code}_Total"] = [i + e for i, e in zip(internal, external)]
+        data[f"{code}_Result"] = ["P" if e >= 18 else "F" for e in external]
+    return pd.DataFrame(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, nargs="+", default=[1000, 4000, 16000])
+    parser.add_argument("--subjects", type=int, default=12)
+    args = parser.parse_args(argv)
+
+    print(f"{'students':>9} {'top rows':>9} {'seconds':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for students in args.students:
+            analyzer = ResultAnalyzer("synthetic.xlsx")
+            analyzer.df_clean = synthetic_cohort(students, args.subjects)
+            analyzer._identify_columns()
+
+            start = time.perf_counter()
+            analyzer.generate_report(os.path.join(tmp, "report.docx"))
+            elapsed = time.perf_counter() - start
+            top_rows = int(analyzer.subject_stats['TopScorers'].map(len).sum())
+            print(f"{students:>9} {top_rows:>9} {elapsed:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""Local stand-in for the VTU results portal.
+
+Serves the same form, CAPTCHA image, alert and result panel markup that the
+scraper engines expect, so they can be exercised and benchmarked offline:
+
+    python tools/mock_portal.py --port 8765 --students 120
+"""
+import argparse
+import random
+import secrets
+import string
+import sys
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlparse
+
+from PIL import Image, ImageDraw
+
+
+CAPTCHA_COLOR = (102, 102, 102)
+CAPTCHA_ALPHABET = string.ascii_uppercase + string.digits
+SUBJECTS = [
+    ("BCS301", "MATHEMATICS FOR COMPUTER SCIENCE"),
+    ("BCS302", "DIGITAL DESIGN AND COMPUTER ORGANIZATION"),
+    ("BCS303", "OPERATING SYSTEMS"),
+    ("BCS304", "DATA STRUCTURES AND APPLICATIONS"),
+    ("BCSL305", "DATA STRUCTURES LAB"),
+    ("BSCK307", "SOCIAL CONNECT AND RESPONSIBILITY"),
+]
+
+INDEX_PAGE = """<html><head><title>VTU Results</title></head><body>
+<form action="resultpage.php" method="post" name="myForm">
+<input type="hidden" name="Token" value="{token}">
+<input type="text" name="lns" class="form-control">
+<img src="captcha_new.php?r={nonce}" alt="CAPTCHA code">
+<a href="#" onclick="refreshCaptcha()">Refresh</a>
+<input type="text" name="captchacode" class="form-control">
+<input type="submit" id="submit" value="SUBMIT">
+</form></body></html>"""
+
+ALERT_PAGE = """<script type="text/javascript">alert('{message}');window.location.href='index.php';</script>"""
+
+
+def render_captcha(code, seed=None):
+    """Draw a CAPTCHA in the portal's single grey with differently coloured noise"""
+    rng = random.Random(seed)
+    small = Image.new("RGB", (60, 12), "white")
+    draw = ImageDraw.Draw(small)
+    draw.fontmode = "1"  # no antialiasing, so text stays exactly CAPTCHA_COLOR
+    draw.text((2, 0), code, fill=CAPTCHA_COLOR)
+    image = small.resize((180, 36), Image.NEAREST)
+    draw = ImageDraw.Draw(image)
+    for _ in range(8):
+        noise = tuple(rng.randint(140, 220) for _ in range(3))
+        draw.line([(rng.randint(0, 180), rng.randint(0, 36)), (rng.randint(0, 180), rng.randint(0, 36))],
+                  fill=noise, width=1)
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def render_result(usn):
+    """Render a deterministic result panel for a USN"""
+    rng = random.Random(usn)
+    rows = ['<div class="divTableRow">' + "".join(
+        f'<div class="divTableCell"><b>{title}</b></div>' for title in
+        ("Subject Code", "Subject Name", "Internal Marks", "External Marks", "Total", "Result", "Updated on")
+    ) + "</div>"]
+    for code, name in SUBJECTS:
+        internal = rng.randint(15, 50)
+        external = rng.randint(10, 50)
+        total = internal + external
+        result = "P" if external >= 18 and total >= 40 else "F"
+        rows.append('<div class="divTableRow">' + "".join(
+            f'<div class="divTableCell">{value}</div>' for value in
+            (code, name, internal, external, total, result, "2025-03-01")
+        ) + "</div>")
+    return f"""<html><body><div class="panel-body"><div class="row">
+<div class="col-md-12"><table class="table table-bordered">
+<tr><td><b>University Seat Number</b></td><td><b> :</b> {usn}</td></tr>
+<tr><td><b>Student Name</b></td><td><b> :</b> STUDENT {usn[-3:]}</td></tr>
+</table>
+<div>Semester : 3</div>
+<div class="divTable"><div class="divTableBody">{"".join(rows)}</div></div>
+</div></div><div class="row"><div class="col-md-12">Footer</div></div></div></body></html>"""
+
+
+class MockPortal(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, students=60, latency=0.0, accept_any_captcha=False):
+        super().__init__(address, MockPortalHandler)
+        self.students = students
+        self.latency = latency
+        self.accept_any_captcha = accept_any_captcha
+        self.sessions = {}
+        self.lock = threading.Lock()
+        self.request_counts = {"index": 0, "captcha": 0, "submit": 0}
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/index.php"
+
+    def is_known_usn(self, usn):
+        suffix = usn[-3:]
+        return len(usn) == 10 and suffix.isdigit() and 1 <= int(suffix) <= self.students
+
+
+class MockPortalHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _session_id(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        if "PHPSESSID" in cookie:
+            return cookie["PHPSESSID"].value, False
+        return secrets.token_hex(8), True
+
+    def _send(self, body, content_type="text/html", session_id=None):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if session_id:
+            self.send_header("Set-Cookie", f"PHPSESSID={session_id}; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+        session_id, new_session = self._session_id()
+        path = urlparse(self.path).path
+
+        if path.endswith("/index.php") or path == "/":
+            with server.lock:
+                server.request_counts["index"] += 1
+            page = INDEX_PAGE.format(token=secrets.token_hex(8), nonce=secrets.token_hex(4))
+            self._send(page, session_id=session_id if new_session else None)
+        elif path.endswith("/captcha_new.php"):
+            code = "".join(random.choice(CAPTCHA_ALPHABET) for _ in range(6))
+            with server.lock:
+                server.request_counts["captcha"] += 1
+                server.sessions[session_id] = code
+            self._send(render_captcha(code), "image/png", session_id=session_id if new_session else None)
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+        if not urlparse(self.path).path.endswith("/resultpage.php"):
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+        session_id, _ = self._session_id()
+        with server.lock:
+            server.request_counts["submit"] += 1
+            expected = server.sessions.pop(session_id, None)
+
+        usn = form.get("lns", "").strip().upper()
+        guess = form.get("captchacode", "").strip()
+        if not server.accept_any_captcha and (expected is None or guess.upper() != expected):
+            self._send(ALERT_PAGE.format(message="Invalid captcha code !!!"))
+        elif not server.is_known_usn(usn):
+            self._send(ALERT_PAGE.format(message="University Seat Number is not available or Invalid..!"))
+        else:
+            self._send(render_result(usn))
+
+
+def start_mock_portal(port=0, **options):
+    """Start a MockPortal on a background thread and return it"""
+    server = MockPortal(("127.0.0.1", port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local stub of the VTU results portal")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--students", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of delay per request")
+    parser.add_argument("--accept-any-captcha", action="store_true")
+    args = parser.parse_args(argv)
+
+    server = MockPortal(("127.0.0.1", args.port), students=args.students, latency=args.latency,
+                        accept_any_captcha=args.accept_any_captcha)
+    print(f"Mock portal listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from vtu_http_fetcher import (get_session, load_result_form, fetch_captcha_image,
+                              submit_result_form, read_result_response, PortalLayoutError)
+from scrape_metrics import NULL_METRICS
+from retry_policy import RetryPolicy, CAPTCHA, PERMANENT
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second, holding at most ``capacity``"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """One token bucket per host, so each portal host gets its own request budget"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+
+    async def acquire(self, url):
+        if not self.rate:
+            return
+        host = urlparse(url).netloc
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+        await bucket.acquire()
+
+
+class AsyncResultScraper:
+    """Keep many USN lookups in flight over the HTTP engine.
+
+    Each lookup runs index -> CAPTCHA -> submit -> parse. Blocking HTTP calls
+    run on an I/O thread pool sized to ``concurrency``; CAPTCHA OCR and
+    parsing run on a separate CPU pool so neither stalls the event loop.
+    Every request first takes a token from the per-host rate limiter.
+    ``parser(usn, html)``, when given, turns each result panel into the
+    value handed to ``on_result``.
+    """
+
+    def __init__(self, captcha_handler, base_url, concurrency=32, rate=10.0, burst=None,
+                 max_retries=50, stop_event=None, parser=None, cpu_workers=None, metrics=None,
+                 retry_policy=None):
+        self.captcha_handler = captcha_handler
+        self.base_url = base_url
+        self.concurrency = max(1, int(concurrency))
+        self.limiter = HostRateLimiter(rate, burst)
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=max_retries)
+        self.stop_event = stop_event
+        self.parser = parser
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        self.metrics = metrics or NULL_METRICS
+
+    def _stopped(self):
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    async def _http(self, url, func, *args, timer=None):
+        await self.limiter.acquire(url)
+        start = time.perf_counter()
+        try:
+            return await self.loop.run_in_executor(self.io_executor, func, *args)
+        finally:
+            if timer:
+                self.metrics.observe(timer, time.perf_counter() - start)
+
+    async def _cpu(self, func, *args):
+        return await self.loop.run_in_executor(self.cpu_executor, func, *args)
+
+    async def _pause_while_degraded(self):
+        budget = self.retry_policy.error_budget
+        while budget.pause_remaining() > 0 and not self._stopped():
+            await asyncio.sleep(min(budget.pause_remaining(), 1.0))
+
+    async def _backoff(self, delay):
+        end = time.monotonic() + delay
+        while not self._stopped() and time.monotonic() < end:
+            await asyncio.sleep(min(end - time.monotonic(), 1.0))
+
+    async def fetch(self, session, usn):
+        """Fetch one USN's result panel HTML, or None.
+
+        Like the HTTP engine, a CAPTCHA miss reuses the loaded form and only
+        downloads a new CAPTCHA image, and retries follow ``retry_policy``.
+        """
+        metrics = self.metrics
+        policy = self.retry_policy
+        state = policy.start(usn)
+        form = None
+        while not state.exhausted():
+            await self._pause_while_degraded()
+            if self._stopped():
+                break
+            try:
+                reused_form = form is not None
+                if reused_form:
+                    metrics.incr("captcha_refreshes")
+                else:
+                    form = await self._http(self.base_url, load_result_form, session, self.base_url,
+                                            timer="page_load")
+
+                captcha_text = ""
+                for _ in range(3):
+                    captcha_png = await self._http(form["captcha_url"], fetch_captcha_image, session, form,
+                                                   timer="captcha_fetch")
+                    captcha_text = (await self._cpu(self.captcha_handler.get_captcha_from_image,
+                                                    captcha_png)).strip()
+                    if len(captcha_text) == 6:
+                        break
+                    metrics.incr("captcha_length_rejects")
+                if len(captcha_text) != 6:
+                    state.captcha_miss()
+                    continue
+
+                submitted_form, form = form, None
+                response = await self._http(submitted_form["action"], submit_result_form, session,
+                                            submitted_form, usn, captcha_text, timer="submit_to_result")
+                alert_text, html_content = await self._cpu(read_result_response, response)
+
+                if alert_text:
+                    kind = policy.classify(alert_text)
+                    if kind == PERMANENT:
+                        self.captcha_handler.record_verified(captcha_png, captcha_text)
+                        metrics.incr("invalid_usn")
+                        metrics.record_usn(usn, state.attempt, "invalid")
+                        return None
+                    if kind == CAPTCHA:
+                        metrics.incr("captcha_server_rejects")
+                        form = submitted_form
+                        state.captcha_miss()
+                    elif reused_form:
+                        metrics.incr("reused_form_rejects")  # maybe a stale token: fresh form, no backoff
+                    else:
+                        await self._backoff(state.transient_error())
+                    continue
+
+                if html_content is None:
+                    if reused_form:
+                        continue
+                    raise PortalLayoutError("Result panel not found in submit response")
+                self.captcha_handler.record_verified(captcha_png, captcha_text)
+                metrics.record_usn(usn, state.attempt, "fetched")
+                return html_content
+
+            except PortalLayoutError:
+                raise
+            except Exception as e:
+                print(f"Error: [Async Attempt {state.attempt}] {usn} failed: {str(e)}")
+                metrics.incr("errors")
+                if policy.classify(e) == PERMANENT:
+                    break
+                delay = state.transient_error()
+                if not state.exhausted():
+                    await self._backoff(delay)
+        metrics.record_usn(usn, state.attempt - 1, "stopped" if self._stopped() else "failed")
+        return None
+
+    async def _worker(self, work, on_start, on_result):
+        session = get_session()
+        try:
+            while not self._stopped():
+                try:
+                    index, usn = work.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                if on_start:
+                    on_start(index, usn)
+                result = None
+                try:
+                    html = await self.fetch(session, usn)
+                    if html is not None:
+                        result = await self._cpu(self.parser, usn, html) if self.parser else html
+                except PortalLayoutError as e:
+                    print(f"Portal layout changed for {usn}: {str(e)}")
+                on_result(index, usn, result)
+        finally:
+            session.close()
+
+    async def run(self, usn_list, on_result, on_start=None):
+        """Scrape ``usn_list``, calling ``on_result(index, usn, result_or_None)`` as each finishes"""
+        self.loop = asyncio.get_running_loop()
+        work = asyncio.Queue()
+        for index, usn in enumerate(usn_list):
+            work.put_nowait((index, usn))
+
+        with ThreadPoolExecutor(self.concurrency, thread_name_prefix="vtu-io") as self.io_executor, \
+                ThreadPoolExecutor(self.cpu_workers, thread_name_prefix="vtu-cpu") as self.cpu_executor:
+            workers = min(self.concurrency, len(usn_list)) or 1
+            await asyncio.gather(*(self._worker(work, on_start, on_result) for _ in range(workers)))
+
+
+def run_async_scraper(usn_list, captcha_handler, base_url, on_result, on_start=None, concurrency=32,
+                      rate=10.0, stop_event=None, parser=None, metrics=None, retry_policy=None):
+    """Blocking entry point that runs AsyncResultScraper on a fresh event loop"""
+    scraper = AsyncResultScraper(captcha_handler, base_url, concurrency=concurrency, rate=rate,
+                                 stop_event=stop_event, parser=parser, metrics=metrics,
+                                 retry_policy=retry_policy)
+    asyncio.run(scraper.run(usn_list, on_result, on_start))
@@ -474,80 +474,288 @@ if __name__ == "__main__":
     app.mainloop()
 '''
 
+import time
+_START = time.perf_counter()
+
 import threading
 import queue
 import os
+import sys
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, Toplevel, Scrollbar, Text
-from captcha_handler import CaptchaHandler
-from vtu_marks_scraper import generate_usn_list, fetch_vtu_result_with_retry, get_driver
-from student_data import parse_student_result
-import pandas as pd
-from Analyzer import analyze_results
+from tkinter import ttk, filedialog, messagebox, Toplevel, Text
+from scrape_metrics import ScrapeMetrics
+from driver_sessions import DriverSessionManager, DriverCrashedError
+from Analyzer import analyze_results  # light: pandas and docx load with the first report
+
+# The scraper engines, pandas, openpyxl and OCR are imported where they are
+# first used (run_scraper, get_missing_usns, the USN buttons), so the window
+# shows before any of them load. startup_report() lists any that slip back in.
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "openpyxl", "docx", "lxml", "bs4",
+                 "requests", "selenium", "webdriver_manager", "PIL", "pytesseract")
 
 # Control flag for stopping threads
 stop_flag = threading.Event()
 DEFAULT_URL = "https://results.vtu.ac.in/DJcbcs25/index.php"
+ENGINES = ("selenium", "http", "async")
+DEFAULT_RATE_LIMIT = 10.0  # requests per second per portal host, async engine only
+
+
+def startup_report():
+    """One log line with the time to a ready window and the heavy modules already imported"""
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    return (f"Start-up: window ready in {(time.perf_counter() - _START) * 1000:.0f} ms, "
+            f"heavy modules loaded: {', '.join(loaded) or 'none'}\n")
+
+
+def generate_usn_list(base="1CR24BA", start=1, end=10):
+    """Generate list of USNs with given base and numeric range"""
+    return [f"{base}{str(i).zfill(3)}" for i in range(start, end + 1)]
 
 
 def get_missing_usns(expected_usns, output_file):
-    """Get list of USNs not present in output file"""
-    if not os.path.exists(output_file):
+    """Get list of USNs not present in output file or its checkpoint"""
+    from checkpoint_store import CheckpointStore
+    from excel_export import fetched_usns
+
+    checkpoint_path = CheckpointStore.path_for(output_file)
+    if not os.path.exists(output_file) and not os.path.exists(checkpoint_path):
         return expected_usns
     try:
-        df = pd.read_excel(output_file)
-        existing_usns = df['University Seat Number'].astype(str).str.upper().unique()
+        existing_usns = set()
+        if os.path.exists(output_file):
+            existing_usns |= fetched_usns(output_file)
+        if os.path.exists(checkpoint_path):
+            existing_usns |= CheckpointStore(checkpoint_path).usns
         return [usn for usn in expected_usns if usn.upper() not in existing_usns]
     except Exception:
         return expected_usns
 
 
-def run_scraper(usn_list, output_path, log_queue, progress_queue, append=False, base_url=DEFAULT_URL, headless=True):
-    """Main scraping function to run in thread"""
+def run_scraper(usn_list, output_path, log_queue, progress_queue, append=False, base_url=DEFAULT_URL, headless=True,
+                workers=1, engine="selenium", rate_limit=DEFAULT_RATE_LIMIT, harvest_captchas=False,
+                metrics=None, long_output=False, sessions=None):
+    """Main scraping function to run in thread.
+
+    USNs are pulled from a shared work queue by ``workers`` independent
+    sessions; all of them report into the same results, log queue and
+    progress queue, and every one of them honours ``stop_flag``.
+
+    ``engine`` selects how results are fetched: "selenium" drives Chrome,
+    "http" talks to the portal directly with requests and falls back to
+    Chrome for a worker if the portal stops serving the expected form.
+    "async" keeps up to ``workers`` HTTP lookups in flight on one event
+    loop, throttled to ``rate_limit`` requests per second per host.
+
+    With ``harvest_captchas`` every CAPTCHA the portal accepts is saved with
+    its answer to DEFAULT_DATASET_DIR for training the kNN solver.
+
+    Timings and retry counts go into ``metrics`` and are saved next to the
+    output as ``<name>_metrics.json`` when the run ends.
+
+    With ``long_output`` the sheet is also saved as ``<name>_long.csv`` with
+    one row per (USN, subject); see student_data.wide_to_long.
+
+    Each fetched student is written to ``<name>_checkpoint.jsonl`` straight
+    away and the Excel file is exported from that checkpoint. USNs in an
+    unfinished checkpoint are skipped, so a crashed or stopped run picks up
+    where it left off; any scrape after a finished run starts afresh, so
+    appending re-fetches the USNs asked for and exports only this batch.
+
+    Browsers come from ``sessions`` (a DriverSessionManager) and go back to
+    it warm when the run ends; without one, a private manager is used and
+    its browsers are quit at the end. A browser that dies mid-run is
+    replaced and its USN is put back on the queue once.
+    """
+    metrics = metrics or ScrapeMetrics()
+    own_sessions = sessions is None
+    if own_sessions:
+        sessions = DriverSessionManager()
+    checkpoint = None
     try:
+        started = time.perf_counter()
+        import pandas as pd
+        from captcha_handler import CaptchaHandler
+        from captcha_classifier import DEFAULT_DATASET_DIR
+        from retry_policy import RetryPolicy, ErrorBudget
+        from student_data import parse_student_record, records_to_dataframe, wide_to_long, read_long_csv
+        from checkpoint_store import CheckpointStore
+        from excel_export import KEY_COLUMNS, export_results, write_usn_index
+        from columnar_store import PARQUET_AVAILABLE, load_columnar, read_sheet, upsert, write_columnar
+        if engine == "async":
+            from vtu_async_scraper import run_async_scraper
+        else:
+            from vtu_http_fetcher import get_session, fetch_vtu_result_http, PortalLayoutError
+        if engine == "selenium":
+            import vtu_marks_scraper  # noqa: F401  load selenium once here rather than in the first worker
+        log_queue.put(f"Scraper modules loaded in {(time.perf_counter() - started) * 1000:.0f} ms\n")
+
+        checkpoint = CheckpointStore(CheckpointStore.path_for(output_path))
+        if checkpoint.complete:
+            checkpoint.reset()  # already exported; only an unfinished run is resumed
+        all_usns = usn_list
+        usn_list = [usn for usn in all_usns if usn not in checkpoint]
+        if len(usn_list) < len(all_usns):
+            log_queue.put(f"Resuming from {checkpoint.path}: skipping "
+                          f"{len(all_usns) - len(usn_list)} USNs already fetched\n")
+
         total = len(usn_list)
-        results = []
-        handler = CaptchaHandler()
+        # One policy for the whole run, so every worker shares the error budget
+        retry_policy = RetryPolicy(error_budget=ErrorBudget(
+            on_pause=lambda seconds: log_queue.put(
+                f"Portal looks degraded, pausing all workers for {seconds:.0f}s\n")))
+        handler = CaptchaHandler(dataset_dir=DEFAULT_DATASET_DIR if harvest_captchas else None, metrics=metrics)
+        workers = max(1, min(int(workers), total or 1))
+
+        usn_queue = queue.Queue()
+        requeued = set()  # USNs already retried once on a replacement browser
+        missing_usns = []
         count = 0
+        lock = threading.Lock()
 
-        driver = get_driver(headless=headless)
-        missing_usns = []
+        def announce(usn, prefix=""):
+            nonlocal count
+            with lock:
+                count += 1
+                progress_queue.put(int((count / total) * 100))
+                log_queue.put(f"{prefix}[{count}/{total}] Fetching: {usn}\n")
 
-        for usn in usn_list:
-            if stop_flag.is_set():
-                log_queue.put("Process manually stopped by user.\n")
-                break
-
-            count += 1
-            progress = int((count / total) * 100)
-            progress_queue.put(progress)
-            log_queue.put(f"[{count}/{total}] Fetching: {usn}\n")
+        def parse_html(usn, html):
+            return parse_student_record(html)
 
-            html = fetch_vtu_result_with_retry(driver, usn, handler, base_url=base_url)
-            if html:
-                tmp_file = f"_tmp_{usn}.html"
-                with open(tmp_file, "w", encoding="utf-8") as f:
-                    f.write(html)
-                df = parse_student_result(tmp_file)
-                results.append(df)
-                os.remove(tmp_file)
-            else:
+        def record(index, usn, student, prefix=""):
+            if student is not None:
+                checkpoint.add(usn, student)
+                return
+            with lock:
                 missing_usns.append(usn)
-                log_queue.put(f"  -> Failed to fetch: {usn}\n")
-
-        driver.quit()
+            log_queue.put(f"{prefix}  -> Failed to fetch: {usn}\n")
+
+        def worker(worker_id):
+            prefix = f"[W{worker_id}] " if workers > 1 else ""
+            driver = None
+            session = get_session() if engine == "http" else None
+            try:
+                if session is None:
+                    driver = sessions.acquire(headless)
+                while not stop_flag.is_set():
+                    try:
+                        index, usn = usn_queue.get_nowait()
+                    except queue.Empty:
+                        break
+
+                    if usn in requeued:
+                        log_queue.put(f"{prefix}Retrying {usn} on a new browser\n")
+                    else:
+                        announce(usn, prefix)
+
+                    html = None
+                    if session is not None:
+                        try:
+                            html = fetch_vtu_result_http(session, usn, handler, base_url=base_url,
+                                                         stop_event=stop_flag, metrics=metrics,
+                                                         retry_policy=retry_policy)
+                        except PortalLayoutError as e:
+                            log_queue.put(f"{prefix}HTTP engine unusable ({str(e)}), falling back to browser\n")
+                            session.close()
+                            session = None
+
+                    if session is None:
+                        # Selenium is only imported by the browser engine or this fallback
+                        from vtu_marks_scraper import fetch_vtu_result_with_retry
+                        if driver is None:
+                            driver = sessions.acquire(headless)
+                        try:
+                            html = fetch_vtu_result_with_retry(driver, usn, handler, base_url=base_url,
+                                                               stop_event=stop_flag, metrics=metrics,
+                                                               retry_policy=retry_policy)
+                        except DriverCrashedError as e:
+                            log_queue.put(f"{prefix}Browser crashed ({str(e)}), starting a new one\n")
+                            metrics.incr("driver_restarts")
+                            if usn not in requeued:
+                                requeued.add(usn)
+                                usn_queue.put((index, usn))
+                            else:
+                                record(index, usn, None, prefix)
+                            dead, driver = driver, None  # nothing to release if the new one fails to start
+                            driver = sessions.replace(dead, headless)
+                            continue
+                    record(index, usn, parse_html(usn, html) if html else None, prefix)
+            except Exception as e:
+                log_queue.put(f"{prefix}Worker error: {str(e)}\n")
+            finally:
+                if session is not None:
+                    session.close()
+                if driver is not None:
+                    sessions.release(driver, headless)
+
+        if engine == "async":
+            run_async_scraper(usn_list, handler, base_url,
+                              on_result=record,
+                              on_start=lambda index, usn: announce(usn),
+                              concurrency=workers, rate=rate_limit,
+                              stop_event=stop_flag, parser=parse_html, metrics=metrics,
+                              retry_policy=retry_policy)
+        else:
+            for index, usn in enumerate(usn_list):
+                usn_queue.put((index, usn))
+            threads = [threading.Thread(target=worker, args=(i + 1,), daemon=True) for i in range(workers)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        if stop_flag.is_set():
+            log_queue.put("Process manually stopped by user.\n")
+        else:
+            # Anything still queued was never picked up (e.g. every browser failed to start)
+            while not usn_queue.empty():
+                missing_usns.append(usn_queue.get_nowait()[1])
+
+        # Export this run plus any resumed unfinished run, in USN list order
+        position = {usn.upper(): i for i, usn in enumerate(all_usns)}
+        exported = [(usn, student) for usn, student in checkpoint.records() if append or usn in position]
+        exported.sort(key=lambda pair: position.get(pair[0], len(position)))
+        results = [student for _, student in exported]
 
         if results:
-            df_all = pd.concat(results, ignore_index=True)
+            df_all = records_to_dataframe(results)
             df_all.fillna("NA", inplace=True)
 
-            if append and os.path.exists(output_path):
-                old_df = pd.read_excel(output_path)
-                df_all = pd.concat([old_df, df_all], ignore_index=True).drop_duplicates()
+            appending = append and os.path.exists(output_path)
+            old_columnar = load_columnar(output_path) if appending else None
 
-            df_all.to_excel(output_path, index=False)
+            # Streamed export; in append mode existing rows are streamed in and upserted by USN
+            saved_usns = export_results(output_path, df_all, append=append)
+            write_usn_index(output_path, saved_usns)
             log_queue.put(f"Results saved to: {output_path}\n")
 
+            # Typed Parquet copy for the analyzer, kept in step with the Excel file
+            if PARQUET_AVAILABLE:
+                if not appending:
+                    full_df = df_all
+                elif old_columnar is not None:
+                    full_df = upsert(old_columnar, df_all)
+                else:
+                    full_df = read_sheet(output_path)  # no current copy yet, start from the merged sheet
+                log_queue.put(f"Columnar copy saved to: {write_columnar(output_path, full_df)}\n")
+
+            if long_output:
+                long_path = os.path.splitext(output_path)[0] + "_long.csv"
+                long_df = wide_to_long(df_all)
+                if append and os.path.exists(long_path):
+                    # Re-fetched students replace all of their old subject rows
+                    old_long = read_long_csv(long_path)
+                    key = [name for name in KEY_COLUMNS if name in old_long.columns and name in long_df.columns]
+                    replaced = old_long.set_index(key).index.isin(long_df.set_index(key).index)
+                    long_df = pd.concat([old_long[~replaced], long_df], ignore_index=True)
+                long_df.to_csv(long_path, index=False)
+                log_queue.put(f"Long format results saved to: {long_path}\n")
+
+            if stop_flag.is_set():
+                log_queue.put(f"Checkpoint kept at {checkpoint.path}; start again to resume.\n")
+            else:
+                checkpoint.mark_complete(exported)
+
         if missing_usns:
             log_queue.put("Missing USNs:\n" + ", ".join(missing_usns) + "\n")
 
@@ -557,11 +765,20 @@ def run_scraper(usn_list, output_path, log_queue, progress_queue, append=False,
     except Exception as e:
         log_queue.put(f"Error: {str(e)}\n")
     finally:
+        if own_sessions:
+            sessions.close_all()
+        if checkpoint is not None:
+            checkpoint.close()
+        try:
+            metrics_path = os.path.splitext(output_path)[0] + "_metrics.json"
+            metrics.to_json(metrics_path)
+            log_queue.put(f"Run statistics saved to: {metrics_path}\n{metrics.format_summary()}\n")
+        except Exception as e:
+            log_queue.put(f"Could not save run statistics: {str(e)}\n")
         progress_queue.put(100)
         log_queue.put("Finished.\n")
         stop_flag.clear()
 
-import sys
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for PyInstaller and normal runs"""
@@ -575,7 +792,7 @@ class VTUGUI(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("VTU Marks Scraper GUI")
-        self.geometry("600x650")
+        self.geometry("600x770")
 
         try:
             self.iconbitmap(resource_path("icon.ico"))
@@ -648,6 +865,10 @@ class VTUGUI(tk.Tk):
         self.end_var = tk.StringVar(value="10")
         ttk.Entry(range_row, textvariable=self.end_var, width=5).pack(side=tk.LEFT, padx=5)
 
+        ttk.Label(range_row, text="Workers:").pack(side=tk.LEFT, padx=(5, 5))
+        self.workers_var = tk.StringVar(value="1")
+        ttk.Spinbox(range_row, from_=1, to=128, textvariable=self.workers_var, width=4).pack(side=tk.LEFT, padx=5)
+
         # Output file row
         output_row = ttk.Frame(input_frame)
         output_row.pack(fill=tk.X, pady=5)
@@ -675,6 +896,26 @@ class VTUGUI(tk.Tk):
                                               variable=self.headless_var)
         self.headless_check.pack(side=tk.LEFT)
 
+        # Save accepted CAPTCHAs for training the offline solver
+        self.harvest_var = tk.BooleanVar()
+        ttk.Checkbutton(options_frame,
+                        text="Save solved CAPTCHAs",
+                        variable=self.harvest_var).pack(side=tk.LEFT, padx=(10, 0))
+
+        # Fetch engine selector
+        ttk.Label(options_frame, text="Engine:").pack(side=tk.LEFT, padx=(10, 5))
+        self.engine_var = tk.StringVar(value=ENGINES[0])
+        ttk.Combobox(options_frame, textvariable=self.engine_var, values=ENGINES,
+                     state="readonly", width=9).pack(side=tk.LEFT)
+
+        # Extra export formats
+        export_frame = ttk.Frame(input_frame)
+        export_frame.pack(fill=tk.X, pady=(5, 0))
+        self.long_var = tk.BooleanVar()
+        ttk.Checkbutton(export_frame,
+                        text="Also save one row per subject (_long.csv)",
+                        variable=self.long_var).pack(side=tk.LEFT)
+
         # Button frame
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X, pady=(10, 5))
@@ -707,6 +948,16 @@ class VTUGUI(tk.Tk):
         self.progress = ttk.Progressbar(main_frame, orient=tk.HORIZONTAL, length=700, mode='determinate')
         self.progress.pack(fill=tk.X, pady=(10, 5))
 
+        # Live run statistics
+        stats_frame = ttk.LabelFrame(main_frame, text="Run Statistics", padding=(5, 5))
+        stats_frame.pack(fill=tk.X, pady=(5, 0))
+        self.stats_var = tk.StringVar(value="No run yet.")
+        ttk.Label(stats_frame, textvariable=self.stats_var, font=('Consolas', 9),
+                  justify=tk.LEFT).pack(anchor=tk.W)
+        self.metrics = None
+        # Browsers stay open between runs, so "Retry Missing USNs" starts straight away
+        self.sessions = DriverSessionManager()
+
         # Log output
         log_frame = ttk.LabelFrame(main_frame, text="Log Output", padding=(5, 5))
         log_frame.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
@@ -730,6 +981,7 @@ class VTUGUI(tk.Tk):
         self.progress_queue = queue.Queue()
         self.process_queue_id = None
         self.after(100, self._process_queue)
+        self.after_idle(lambda: self.log_queue.put(startup_report()))
 
     def _process_queue(self):
         """Internal method to process queue messages with error handling"""
@@ -772,19 +1024,34 @@ class VTUGUI(tk.Tk):
             messagebox.showerror("Error", "Please enter a valid results URL")
             return
 
+        workers = self._get_workers()
+        if workers is None:
+            return
+
         self.start_btn.config(state=tk.DISABLED)
         self.retry_btn.config(state=tk.DISABLED)
         self.analyze_btn.config(state=tk.DISABLED)
         stop_flag.clear()
 
         usn_list = generate_usn_list(base=base, start=int(start), end=int(end))
+        self.metrics = ScrapeMetrics()
         threading.Thread(
             target=run_scraper,
             args=(usn_list, output, self.log_queue, self.progress_queue,
-                  self.append_var.get(), url, not self.headless_var.get()),
+                  self.append_var.get(), url, not self.headless_var.get(), workers, self.engine_var.get()),
+            kwargs={"harvest_captchas": self.harvest_var.get(), "metrics": self.metrics,
+                    "long_output": self.long_var.get(), "sessions": self.sessions},
             daemon=True
         ).start()
 
+    def _get_workers(self):
+        """Validate the worker count field, returning None if it is invalid"""
+        workers = self.workers_var.get().strip()
+        if not workers.isdigit() or int(workers) < 1:
+            messagebox.showerror("Error", "Please enter a worker count of at least 1")
+            return None
+        return int(workers)
+
     def stop_scraping(self):
         stop_flag.set()
         self.start_btn.config(state=tk.NORMAL)
@@ -899,16 +1166,23 @@ class VTUGUI(tk.Tk):
                 messagebox.showinfo("Info", "No USNs entered to fetch")
                 return
 
+            workers = self._get_workers()
+            if workers is None:
+                return
+
             # Start scraping with the selected USNs
             self.start_btn.config(state=tk.DISABLED)
             self.retry_btn.config(state=tk.DISABLED)
             self.analyze_btn.config(state=tk.DISABLED)
             stop_flag.clear()
 
+            self.metrics = ScrapeMetrics()
             threading.Thread(
                 target=run_scraper,
                 args=(usn_list, output, self.log_queue, self.progress_queue,
-                      True, url, not show_browser_var.get()),
+                      True, url, not show_browser_var.get(), workers, self.engine_var.get()),
+                kwargs={"harvest_captchas": self.harvest_var.get(), "metrics": self.metrics,
+                        "long_output": self.long_var.get(), "sessions": self.sessions},
                 daemon=True
             ).start()
 
@@ -980,9 +1254,11 @@ class VTUGUI(tk.Tk):
             self.log_text.insert(tk.END, msg)
             self.log_text.see(tk.END)
 
+        progressed = False
         while not self.progress_queue.empty():
             val = self.progress_queue.get_nowait()
             self.progress['value'] = val
+            progressed = True
 
             # Re-enable buttons when progress completes
             if val == 100:
@@ -990,10 +1266,15 @@ class VTUGUI(tk.Tk):
                 self.retry_btn.config(state=tk.NORMAL)
                 self.analyze_btn.config(state=tk.NORMAL)
 
+        # Refresh the statistics panel whenever the run has moved on
+        if progressed and self.metrics is not None:
+            self.stats_var.set(self.metrics.format_summary())
+
     def destroy(self):
         """Override destroy to clean up scheduled callbacks"""
         if self.process_queue_id:
             self.after_cancel(self.process_queue_id)
+        self.sessions.close_all()
         super().destroy()
 
 
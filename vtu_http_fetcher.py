@@ -0,0 +1,196 @@
+import re
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+from scrape_metrics import NULL_METRICS
+from retry_policy import RetryPolicy, CAPTCHA, PERMANENT
+
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0 Safari/537.36")
+ALERT_PATTERN = re.compile(r"alert\(\s*(['\"])(.*?)\1\s*\)", re.S)
+
+
+class PortalLayoutError(Exception):
+    """Raised when a portal page does not look like the VTU result form"""
+
+
+def get_session():
+    """Create a requests session that presents itself like a browser"""
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+def load_result_form(session, base_url, timeout=30):
+    """GET the index page and describe its result form and CAPTCHA image"""
+    response = session.get(base_url, timeout=timeout)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.text, "html.parser")
+
+    usn_input = soup.find("input", attrs={"name": "lns"})
+    form = usn_input.find_parent("form") if usn_input else None
+    captcha_img = soup.find("img", attrs={"alt": "CAPTCHA code"})
+    if form is None or captcha_img is None or not captcha_img.get("src"):
+        raise PortalLayoutError(f"Result form not found on {response.url}")
+
+    fields = {}
+    for field in form.find_all("input"):
+        name = field.get("name")
+        if name and field.get("type", "text").lower() not in ("submit", "button", "image"):
+            fields[name] = field.get("value", "")
+
+    return {
+        "action": urljoin(response.url, form.get("action") or response.url),
+        "fields": fields,
+        "captcha_url": urljoin(response.url, captcha_img["src"]),
+        "referer": response.url,
+    }
+
+
+def fetch_captcha_image(session, form, timeout=30):
+    """Download the CAPTCHA image bytes for a loaded form"""
+    response = session.get(form["captcha_url"], headers={"Referer": form["referer"]}, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+
+def submit_result_form(session, form, usn, captcha_text, timeout=30):
+    """POST the USN and CAPTCHA guess and return the response HTML"""
+    data = dict(form["fields"])
+    data["lns"] = usn
+    data["captchacode"] = captcha_text
+    response = session.post(form["action"], data=data, headers={"Referer": form["referer"]}, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+
+def read_result_response(html):
+    """Split a submit response into (alert text, result panel HTML)"""
+    match = ALERT_PATTERN.search(html)
+    if match:
+        return match.group(2).strip(), None
+
+    soup = BeautifulSoup(html, "html.parser")
+    result_container = soup.select_one("div.panel-body > div.row")
+    if result_container is None:
+        return None, None
+    return None, str(result_container)
+
+
+def fetch_vtu_result_http(session, usn, captcha_handler, max_retries=50, base_url=None, stop_event=None,
+                          metrics=None, retry_policy=None):
+    """Fetch VTU result over plain HTTP with the same contract as the Selenium path.
+
+    Returns the result panel HTML, or None if the USN is invalid or every
+    attempt failed. Raises PortalLayoutError when the portal does not serve
+    the expected form, so the caller can fall back to the browser engine.
+
+    After a CAPTCHA miss the already loaded form is reused and only a new
+    CAPTCHA image is downloaded; the index page is fetched again only after
+    an error or if the portal stops accepting the reused form. Retries follow
+    ``retry_policy`` exactly as in fetch_vtu_result_with_retry.
+    """
+    metrics = metrics or NULL_METRICS
+    policy = retry_policy or RetryPolicy(max_attempts=max_retries)
+    state = policy.start(usn)
+    form = None
+    while not state.exhausted():
+        policy.error_budget.wait_if_paused(stop_event)
+        if stop_event is not None and stop_event.is_set():
+            print(f"Stop requested. Abandoning USN: {usn}")
+            metrics.record_usn(usn, state.attempt - 1, "stopped")
+            return None
+        try:
+            print(f"[HTTP Attempt {state.attempt}/{policy.max_attempts}] Processing USN: {usn}")
+
+            reused_form = form is not None
+            if reused_form:
+                metrics.incr("captcha_refreshes")
+            else:
+                with metrics.timer("page_load"):
+                    form = load_result_form(session, base_url)
+
+            # CAPTCHA solving
+            captcha_valid = False
+            captcha_retries = 0
+            max_captcha_retries = 3
+
+            while not captcha_valid and captcha_retries < max_captcha_retries:
+                with metrics.timer("captcha_fetch"):
+                    captcha_png = fetch_captcha_image(session, form)
+                captcha_text = captcha_handler.get_captcha_from_image(captcha_png).strip()
+                print(f"Solved CAPTCHA: {captcha_text} (Length: {len(captcha_text)})")
+
+                if len(captcha_text) == 6:
+                    captcha_valid = True
+                else:
+                    captcha_retries += 1
+                    metrics.incr("captcha_length_rejects")
+                    print(f"CAPTCHA too short, retrying... ({captcha_retries}/{max_captcha_retries})")
+
+            if not captcha_valid:
+                print("Failed to get valid CAPTCHA after retries")
+                state.captcha_miss()
+                continue
+
+            # Only a CAPTCHA miss keeps the form for the next attempt
+            submitted_form, form = form, None
+
+            with metrics.timer("submit_to_result"):
+                alert_text, html_content = read_result_response(
+                    submit_result_form(session, submitted_form, usn, captcha_text))
+
+            if alert_text:
+                kind = policy.classify(alert_text)
+                if kind == PERMANENT:
+                    captcha_handler.record_verified(captcha_png, captcha_text)
+                    print("Invalid USN. Skipping further attempts.")
+                    metrics.incr("invalid_usn")
+                    metrics.record_usn(usn, state.attempt, "invalid")
+                    return None
+                elif kind == CAPTCHA:
+                    print(f"[CAPTCHA error Attempt {state.attempt}] Failed : Retrying")
+                    metrics.incr("captcha_server_rejects")
+                    form = submitted_form
+                    state.captcha_miss()
+                elif reused_form:
+                    # The portal may reject a re-posted token; retry once on a fresh form first
+                    print(f"Portal alert on reused form: {alert_text}; reloading page")
+                    metrics.incr("reused_form_rejects")
+                else:
+                    print(f"Portal alert: {alert_text}")
+                    state.wait(state.transient_error(), stop_event)
+                continue
+
+            if html_content is None:
+                if reused_form:
+                    # The portal may not accept a form twice; start from a fresh page
+                    print("Reused form was not accepted, reloading page")
+                    continue
+                raise PortalLayoutError("Result panel not found in submit response")
+
+            captcha_handler.record_verified(captcha_png, captcha_text)
+            metrics.record_usn(usn, state.attempt, "fetched")
+            print("Successfully fetched result")
+            return html_content
+
+        except PortalLayoutError:
+            raise
+        except Exception as e:
+            print(f"Error: [HTTP Attempt {state.attempt}] Failed: {str(e)}")
+            metrics.incr("errors")
+            if policy.classify(e) == PERMANENT:
+                print(f"Unrecoverable error for USN: {usn}")
+                metrics.record_usn(usn, state.attempt, "failed")
+                return None
+            delay = state.transient_error()
+            if not state.exhausted():
+                print(f"Retrying in {delay:.1f}s.....")
+                state.wait(delay, stop_event)
+
+    print(f"All {state.attempt - 1} attempts failed for USN: {usn}")
+    metrics.record_usn(usn, state.attempt - 1, "failed")
+    return None
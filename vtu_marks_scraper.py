@@ -1,26 +1,24 @@
 import time
-import os
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import (UnexpectedAlertPresentException,
-                                        NoAlertPresentException,
-                                        NoSuchElementException)
+from selenium.common.exceptions import NoAlertPresentException, TimeoutException
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from Analyzer import analyze_results
+from chromedriver_cache import resolve_chromedriver, forget_chromedriver, remember_chromedriver
+from driver_sessions import DriverCrashedError, session_alive
+from scrape_metrics import NULL_METRICS
+from retry_policy import RetryPolicy, CAPTCHA, PERMANENT
 
 
+def get_driver(headless=True, offline=None):
+    """Initialize and return a Chrome WebDriver with proper options.
 
-def generate_usn_list(base="1CR24BA", start=1, end=10):
-    """Generate list of USNs with given base and numeric range"""
-    return [f"{base}{str(i).zfill(3)}" for i in range(start, end + 1)]
-
-
-def get_driver(headless=True):
-    """Initialize and return a Chrome WebDriver with proper options"""
+    The chromedriver binary comes from chromedriver_cache, so it is looked up
+    (and possibly downloaded) once per Chrome version rather than on every
+    call; ``offline`` is passed on to resolve_chromedriver.
+    """
     options = Options()
     if headless:
         options.add_argument("--headless")
@@ -30,34 +28,108 @@ def get_driver(headless=True):
     #options.add_argument("--log-level=3")
     options.add_experimental_option('excludeSwitches', ['enable-logging'])
 
+    driver_path = resolve_chromedriver(offline=offline)
     try:
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        driver.set_page_load_timeout(30)
-        return driver
+        if driver_path:
+            driver = webdriver.Chrome(service=Service(driver_path), options=options)
+        else:
+            driver = webdriver.Chrome(options=options)
     except Exception as e:
+        if not driver_path:
+            print(f"Failed to initialize WebDriver: {e}")
+            raise
+        print(f"chromedriver {driver_path} failed to start ({e}), letting Selenium find one")
+        forget_chromedriver(driver_path)
+        driver_path = None
         driver = webdriver.Chrome(options=options)
-        return driver
-    except:
-        print(f"Failed to initialize WebDriver: {e}")
-        raise
+    if not driver_path:
+        # Selenium Manager found one; reuse it for the rest of the pool and later runs
+        remember_chromedriver(getattr(driver.service, "path", None))
+    driver.set_page_load_timeout(30)
+    return driver
 
 
 
-def fetch_vtu_result_with_retry(driver, usn, captcha_handler, max_retries=50, base_url=None):
-    """Fetch VTU result with retry mechanism"""
-    attempt = 1
-    while attempt <= max_retries:
-        try:
-            print(f"[Attempt {attempt}/{max_retries}] Processing USN: {usn}")
+# Point the CAPTCHA <img> at a fresh cache-busted URL and report once it has loaded
+REFRESH_CAPTCHA_SCRIPT = """
+var img = arguments[0], done = arguments[arguments.length - 1];
+var src = img.getAttribute('src').replace(/([?&])_r=\\d+&?/, '$1').replace(/[?&]$/, '');
+img.onload = function () { done(true); };
+img.onerror = function () { done(false); };
+img.src = src + (src.indexOf('?') === -1 ? '?' : '&') + '_r=' + Date.now();
+"""
+
+
+def refresh_captcha(driver):
+    """Load a new CAPTCHA into the current page without reloading the page"""
+    captcha_element = driver.find_element(By.XPATH, '//*[@alt="CAPTCHA code"]')
+    if not driver.execute_async_script(REFRESH_CAPTCHA_SCRIPT, captcha_element):
+        raise RuntimeError("CAPTCHA image failed to reload")
 
-            # Load the result page
-            driver.get(base_url)
-            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.NAME, "lns")))
 
-            # Enter USN
+def result_form_ready(driver, timeout=3):
+    """Check whether the result form is (still) on the current page"""
+    try:
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.NAME, "lns")))
+        return True
+    except TimeoutException:
+        return False
+
+
+def fetch_vtu_result_with_retry(driver, usn, captcha_handler, max_retries=50, base_url=None, stop_event=None,
+                                metrics=None, retry_policy=None):
+    """Fetch VTU result with retry mechanism.
+
+    ``retry_policy`` (a RetryPolicy, by default one allowing ``max_retries``
+    attempts) decides how long to keep trying: CAPTCHA misses are retried at
+    once, transient errors back off with jitter and count against the run's
+    error budget, and permanent failures end the USN straight away.
+
+    A CAPTCHA that is too short only refreshes the CAPTCHA image on the open
+    form. After a CAPTCHA the portal rejects, its alert page redirects back
+    to the form, so that redirect is waited for and used instead of loading
+    the page a second time. Otherwise the page is reloaded from ``base_url``.
+
+    Timings and reject counts are recorded into ``metrics`` (a ScrapeMetrics).
+
+    Raises DriverCrashedError as soon as an error turns out to come from a
+    dead browser, so the caller can start a new one instead of spending
+    the remaining attempts on it.
+    """
+    metrics = metrics or NULL_METRICS
+    policy = retry_policy or RetryPolicy(max_attempts=max_retries)
+    state = policy.start(usn)
+    fast_retry = False
+    redirected = False
+    while not state.exhausted():
+        policy.error_budget.wait_if_paused(stop_event)
+        if stop_event is not None and stop_event.is_set():
+            print(f"Stop requested. Abandoning USN: {usn}")
+            metrics.record_usn(usn, state.attempt - 1, "stopped")
+            return None
+        try:
+            print(f"[Attempt {state.attempt}/{policy.max_attempts}] Processing USN: {usn}")
+
+            if fast_retry and result_form_ready(driver):
+                # Keep the open form and only fetch a new CAPTCHA
+                metrics.incr("captcha_refreshes")
+                with metrics.timer("captcha_refresh"):
+                    refresh_captcha(driver)
+            elif redirected and result_form_ready(driver, timeout=10):
+                # The alert page has already navigated back to a fresh form and CAPTCHA
+                metrics.incr("captcha_redirects")
+            else:
+                # Load the result page
+                with metrics.timer("page_load"):
+                    driver.get(base_url)
+                    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.NAME, "lns")))
+            fast_retry = redirected = False
+
+            # Enter USN (kept if the form still holds it)
             usn_input = driver.find_element(By.NAME, "lns")
-            usn_input.clear()
-            usn_input.send_keys(usn)
+            if usn_input.get_attribute("value") != usn:
+                usn_input.clear()
+                usn_input.send_keys(usn)
 
             # CAPTCHA solving
             captcha_valid = False
@@ -65,8 +137,9 @@ def fetch_vtu_result_with_retry(driver, usn, captcha_handler, max_retries=50, ba
             max_captcha_retries = 3
 
             while not captcha_valid and captcha_retries < max_captcha_retries:
-                captcha_element = driver.find_element(By.XPATH, '//*[@alt="CAPTCHA code"]')
-                captcha_png = captcha_element.screenshot_as_png
+                with metrics.timer("captcha_fetch"):
+                    captcha_element = driver.find_element(By.XPATH, '//*[@alt="CAPTCHA code"]')
+                    captcha_png = captcha_element.screenshot_as_png
                 captcha_text = captcha_handler.get_captcha_from_image(captcha_png).strip()
                 print(f"Solved CAPTCHA: {captcha_text} (Length: {len(captcha_text)})")
 
@@ -74,18 +147,24 @@ def fetch_vtu_result_with_retry(driver, usn, captcha_handler, max_retries=50, ba
                     captcha_valid = True
                 else:
                     captcha_retries += 1
+                    metrics.incr("captcha_length_rejects")
                     print(f"CAPTCHA too short, retrying... ({captcha_retries}/{max_captcha_retries})")
-                    #driver.find_element(By.XPATH, '//a[contains(text(), "Refresh")]').click()
+                    if captcha_retries < max_captcha_retries:
+                        metrics.incr("captcha_refreshes")
+                        with metrics.timer("captcha_refresh"):
+                            refresh_captcha(driver)
 
             if not captcha_valid:
                 print("Failed to get valid CAPTCHA after retries")
-                attempt += 1
+                fast_retry = True
+                state.captcha_miss()
                 continue
 
             # Fill CAPTCHA and submit
             captcha_input = driver.find_element(By.NAME, 'captchacode')
             captcha_input.clear()
             captcha_input.send_keys(captcha_text)
+            submitted = time.perf_counter()
             driver.find_element(By.ID, "submit").click()
 
             WebDriverWait(driver, 10).until(
@@ -100,13 +179,24 @@ def fetch_vtu_result_with_retry(driver, usn, captcha_handler, max_retries=50, ba
                 alert_text = alert.text.strip()
                 alert.accept()
 
-                if "University Seat Number is not available or Invalid" in alert_text:
+                kind = policy.classify(alert_text)
+                if kind == PERMANENT:
+                    captcha_handler.record_verified(captcha_png, captcha_text)
                     print("Invalid USN. Skipping further attempts.")
+                    metrics.incr("invalid_usn")
+                    metrics.record_usn(usn, state.attempt, "invalid")
                     return None
 
-                elif "Invalid captcha code !!!" in alert_text:
-                    print(f"[CAPTCHA error Attempt {attempt}] Failed : Retrying")
-                    attempt += 1
+                elif kind == CAPTCHA:
+                    print(f"[CAPTCHA error Attempt {state.attempt}] Failed : Retrying")
+                    metrics.incr("captcha_server_rejects")
+                    redirected = True
+                    state.captcha_miss()
+                    continue
+
+                else:
+                    print(f"Portal alert: {alert_text}")
+                    state.wait(state.transient_error(), stop_event)
                     continue
 
             except NoAlertPresentException:
@@ -116,20 +206,26 @@ def fetch_vtu_result_with_retry(driver, usn, captcha_handler, max_retries=50, ba
             time.sleep(2)
             result_container = driver.find_element(By.XPATH, '//div[@class="panel-body"]/div[@class="row"][1]')
             html_content = result_container.get_attribute('outerHTML')
+            captcha_handler.record_verified(captcha_png, captcha_text)
+            metrics.observe("submit_to_result", time.perf_counter() - submitted)
+            metrics.record_usn(usn, state.attempt, "fetched")
             print("Successfully fetched result")
             return html_content
 
         except Exception as e:
-            print(f"Error: [Attempt {attempt}] Failed: {str(e)}")
-            attempt += 1
-            if attempt <= max_retries:
-                print("Retrying.....")
-
-    print(f"All {max_retries} attempts failed for USN: {usn}")
+            print(f"Error: [Attempt {state.attempt}] Failed: {str(e)}")
+            metrics.incr("errors")
+            if not session_alive(driver):
+                raise DriverCrashedError(str(e)) from e
+            if policy.classify(e) == PERMANENT:
+                print(f"Unrecoverable error for USN: {usn}")
+                metrics.record_usn(usn, state.attempt, "failed")
+                return None
+            delay = state.transient_error()
+            if not state.exhausted():
+                print(f"Retrying in {delay:.1f}s.....")
+                state.wait(delay, stop_event)
+
+    print(f"All {state.attempt - 1} attempts failed for USN: {usn}")
+    metrics.record_usn(usn, state.attempt - 1, "failed")
     return None
-
-
-
-
-
-
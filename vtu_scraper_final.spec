@@ -7,7 +7,7 @@ a = Analysis(
     datas=[
         ('Tesseract-OCR', 'Tesseract-OCR'),  # For captcha handling
         ('icon.ico', '.'),  # Application icon
-        ('analyzer.py', '.'),  # Include analyzer module
+        ('Analyzer.py', '.'),  # Include analyzer module
         ('student_data.py', '.'),  # Include student data parser
         ('vtu_marks_scraper.py', '.'),  # Include scraper module
         ('captcha_handler.py', '.')  # Include captcha handler
@@ -31,12 +31,25 @@ a = Analysis(
         'urllib3',  # selenium dependency
         'selenium.webdriver.common',
         'selenium.webdriver.chrome',
-        'selenium.webdriver.support'
+        'selenium.webdriver.support',
+        # Project modules the GUI imports lazily, on first use
+        'scrape_metrics',
+        'retry_policy',
+        'checkpoint_store',
+        'excel_export',
+        'columnar_store',
+        'captcha_classifier',
+        'vtu_http_fetcher',
+        'vtu_async_scraper',
+        'chromedriver_cache',
+        'driver_sessions'
     ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['matplotlib', 'scipy', 'IPython', 'notebook', 'pytest',  # never used; less to unpack at start-up
+              'tesserocr',  # opt-in OCR backend for source installs; the exe uses pytesseract
+              'pyarrow'],  # optional Parquet copy; too big for the one-file exe, Excel is read instead
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,